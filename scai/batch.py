@@ -0,0 +1,55 @@
+import json
+import re
+
+REFERENCE = re.compile(r"\$\{([^}]+)\}")
+
+
+def parse_steps(text: str) -> tuple[list[dict], dict]:
+    stripped = text.strip()
+    if not stripped:
+        return [], {}
+    try:
+        document = json.loads(stripped)
+    except json.JSONDecodeError:
+        document = None
+    if isinstance(document, list):
+        return document, {}
+    if isinstance(document, dict):
+        if "steps" in document:
+            options = {key: value for key, value in document.items() if key != "steps"}
+            return list(document["steps"]), options
+        return [document], {}
+    steps = []
+    for line in stripped.splitlines():
+        line = line.strip()
+        if line:
+            steps.append(json.loads(line))
+    return steps, {}
+
+
+def lookup(results: dict[str, object], expression: str) -> object:
+    name, _, path = expression.strip().partition(".")
+    if name not in results:
+        raise ValueError(f"unknown step reference: {name}")
+    value = results[name]
+    for part in path.split(".") if path else []:
+        if isinstance(value, list) and part.lstrip("-").isdigit() and -len(value) <= int(part) < len(value):
+            value = value[int(part)]
+        elif isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            raise ValueError(f"unresolved reference: {expression}")
+    return value
+
+
+def resolve_references(value: object, results: dict[str, object]) -> object:
+    if isinstance(value, str):
+        match = REFERENCE.fullmatch(value)
+        if match:
+            return lookup(results, match.group(1))
+        return REFERENCE.sub(lambda item: str(lookup(results, item.group(1))), value)
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results) for item in value]
+    return value
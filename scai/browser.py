@@ -0,0 +1,379 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from contextlib import suppress
+from pathlib import Path
+from uuid import uuid4
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from .cdp import CDP_TIMEOUT, CdpConnection, browser_websocket_url
+from .config import BASE_DIR, CHROME_BINARY, LOG_PATH
+
+CERTIFICATE_DIR = BASE_DIR / "certs"
+PROFILE_BASE = BASE_DIR / "profiles"
+PAGE_LOAD_TIMEOUT = 60
+CHROME_CANDIDATES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+TEMPLATE_MANIFEST = "template.json"
+TEMPLATE_LOCK = threading.Lock()
+TEMPLATE_PRUNE_AGE = 7 * 24 * 3600
+
+
+def chrome_fingerprint() -> str:
+    candidates = [CHROME_BINARY] if CHROME_BINARY else [shutil.which(name) for name in CHROME_CANDIDATES]
+    for candidate in candidates:
+        if not candidate:
+            continue
+        with suppress(OSError):
+            path = Path(candidate).resolve()
+            stat = path.stat()
+            return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+    return "unknown"
+
+
+def template_key() -> str:
+    digest = hashlib.sha256(chrome_fingerprint().encode("utf-8"))
+    if CERTIFICATE_DIR.exists():
+        for cert_path in sorted(CERTIFICATE_DIR.glob("*.crt")):
+            digest.update(b"\0" + cert_path.name.encode("utf-8") + b"\0")
+            digest.update(cert_path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class FocusedDriver:
+    def __init__(self, worker: "BrowserWorker", driver) -> None:
+        self.worker = worker
+        self.driver = driver
+
+    def __getattr__(self, name: str):
+        try:
+            value = getattr(self.driver, name)
+        except WebDriverException:
+            self.worker.focused_handle = None
+            raise
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            try:
+                return value(*args, **kwargs)
+            except WebDriverException:
+                self.worker.focused_handle = None
+                raise
+
+        return call
+
+
+class BrowserWorker:
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.driver = None
+        self.profile_dir: Path | None = None
+        self.lock = threading.RLock()
+        self.cdp: CdpConnection | None = None
+        self.handle_prefix = ""
+        self.focused_handle: str | None = None
+        self.sessions: dict[str, str] = {}
+        self.session_lock = threading.Lock()
+        self.session_hooks: list[Callable[["BrowserWorker", str, str], None]] = []
+
+    @property
+    def log_path(self) -> Path:
+        if self.index == 0:
+            return LOG_PATH
+        return LOG_PATH.with_name(f"driver-{self.index}.log")
+
+    def start(self) -> None:
+        if self.driver is not None:
+            return
+        PROFILE_BASE.mkdir(parents=True, exist_ok=True)
+        with suppress(Exception):
+            PROFILE_BASE.chmod(0o700)
+        profile_dir = PROFILE_BASE / f"profile-{os.getpid()}-{self.index}-{uuid4().hex}"
+        if profile_dir.exists():
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        template_dir = self.profile_template()
+        if template_dir is not None:
+            shutil.copytree(
+                template_dir,
+                profile_dir,
+                ignore=shutil.ignore_patterns(TEMPLATE_MANIFEST),
+                dirs_exist_ok=True,
+            )
+        else:
+            profile_dir.mkdir(parents=True)
+            self.ensure_certificate_trust(profile_dir)
+            (profile_dir / "First Run").touch()
+        self.profile_dir = profile_dir
+        self.cleanup_profile_locks(profile_dir)
+        options = Options()
+        if CHROME_BINARY:
+            options.binary_location = CHROME_BINARY
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-software-rasterizer")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--disable-default-apps")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--remote-allow-origins=*")
+        options.page_load_strategy = "eager"
+        options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+        service = ChromeService(log_path=str(self.log_path))
+        self.driver = webdriver.Chrome(service=service, options=options)
+        self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        with suppress(Exception):
+            self.driver.execute_cdp_cmd("Network.enable", {})
+        with suppress(Exception):
+            self.driver.execute_cdp_cmd("Log.enable", {})
+        handles = self.driver.window_handles
+        if handles and handles[0].startswith("CDwindow-"):
+            self.handle_prefix = "CDwindow-"
+        self.focused_handle = self.driver.current_window_handle
+
+    def connect_cdp(self) -> CdpConnection | None:
+        if self.cdp is not None:
+            self.cdp.close()
+        self.cdp = None
+        with self.session_lock:
+            self.sessions.clear()
+        if self.driver is None:
+            return None
+        with suppress(Exception):
+            address = self.driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+            self.cdp = CdpConnection(browser_websocket_url(address)).open()
+            self.cdp.on("Target.detachedFromTarget", self.on_detached)
+            self.cdp.on("Target.targetDestroyed", self.on_destroyed)
+        return self.cdp
+
+    @property
+    def has_cdp(self) -> bool:
+        return self.cdp is not None and not self.cdp.closed.is_set()
+
+    def session(self, handle: str) -> str:
+        if not self.has_cdp:
+            raise RuntimeError("devtools connection unavailable")
+        target_id = self.target_of(handle)
+        with self.session_lock:
+            session_id = self.sessions.get(target_id)
+            if session_id is not None:
+                return session_id
+            result = self.cdp.call("Target.attachToTarget", {"targetId": target_id, "flatten": True})
+            session_id = result["sessionId"]
+            self.sessions[target_id] = session_id
+        for hook in self.session_hooks:
+            with suppress(Exception):
+                hook(self, handle, session_id)
+        return session_id
+
+    def handle_of_session(self, session_id: str | None) -> str | None:
+        with self.session_lock:
+            for target_id, candidate in self.sessions.items():
+                if candidate == session_id:
+                    return self.handle_for(target_id)
+        return None
+
+    def on_detached(self, params: dict, _session: str | None) -> None:
+        with self.session_lock:
+            for target_id, session_id in list(self.sessions.items()):
+                if session_id == params.get("sessionId"):
+                    self.sessions.pop(target_id, None)
+                    self.forget_focus(target_id)
+
+    def on_destroyed(self, params: dict, _session: str | None) -> None:
+        self.forget_focus(params.get("targetId", ""))
+
+    def forget_focus(self, target_id: str) -> None:
+        handle = self.focused_handle
+        if handle is not None and self.target_of(handle) == target_id:
+            self.focused_handle = None
+
+    def target_call(self, handle: str, method: str, params: dict | None = None, timeout: float = CDP_TIMEOUT) -> dict:
+        return self.cdp.call(method, params, self.session(handle), timeout)
+
+    def evaluate(
+        self,
+        handle: str,
+        expression: str,
+        timeout: float = CDP_TIMEOUT,
+        await_promise: bool = False,
+    ) -> object:
+        result = self.target_call(
+            handle,
+            "Runtime.evaluate",
+            {"expression": expression, "returnByValue": True, "awaitPromise": await_promise},
+            timeout,
+        )
+        details = result.get("exceptionDetails")
+        if details:
+            exception = details.get("exception") or {}
+            raise RuntimeError(exception.get("description") or details.get("text") or "script error")
+        return (result.get("result") or {}).get("value")
+
+    def handle_for(self, target_id: str) -> str:
+        return f"{self.handle_prefix}{target_id}"
+
+    def target_of(self, handle: str) -> str:
+        return handle[len(self.handle_prefix):] if handle.startswith(self.handle_prefix) else handle
+
+    def profile_template(self) -> Path | None:
+        key = template_key()
+        template_dir = PROFILE_BASE / f"template-{key}"
+        with TEMPLATE_LOCK:
+            if (template_dir / TEMPLATE_MANIFEST).exists():
+                with suppress(OSError):
+                    os.utime(template_dir)
+                return template_dir
+            build_dir = PROFILE_BASE / f".template-{os.getpid()}-{uuid4().hex}"
+            build_dir.mkdir(parents=True)
+            try:
+                if not self.ensure_certificate_trust(build_dir):
+                    return None
+                (build_dir / "First Run").touch()
+                manifest = {"key": key, "chrome": chrome_fingerprint()}
+                (build_dir / TEMPLATE_MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+                if not (template_dir / TEMPLATE_MANIFEST).exists():
+                    shutil.rmtree(template_dir, ignore_errors=True)
+                    with suppress(OSError):
+                        build_dir.rename(template_dir)
+            finally:
+                shutil.rmtree(build_dir, ignore_errors=True)
+            cutoff = time.time() - TEMPLATE_PRUNE_AGE
+            for stale in PROFILE_BASE.glob("template-*"):
+                with suppress(OSError):
+                    if stale != template_dir and stale.stat().st_mtime < cutoff:
+                        shutil.rmtree(stale, ignore_errors=True)
+        return template_dir
+
+    def cleanup_profile_locks(self, profile_dir: Path) -> None:
+        for name in ("SingletonLock", "SingletonSocket", "SingletonCookie"):
+            path = profile_dir / name
+            with suppress(Exception):
+                if path.exists():
+                    if path.is_dir():
+                        shutil.rmtree(path)
+                    else:
+                        path.unlink()
+
+    def ensure_certificate_trust(self, profile_dir: Path) -> bool:
+        if not CERTIFICATE_DIR.exists():
+            return True
+        try:
+            self.ensure_nss_db(profile_dir)
+            aliases = self.list_nss_certs(profile_dir)
+            for cert_path in sorted(CERTIFICATE_DIR.glob("*.crt")):
+                alias = cert_path.stem
+                if alias in aliases:
+                    continue
+                self.import_nss_cert(profile_dir, alias, cert_path, "TCu,Cu,Tu")
+                aliases.add(alias)
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return False
+        return True
+
+    def ensure_nss_db(self, profile_dir: Path) -> None:
+        db_path = profile_dir / "cert9.db"
+        if db_path.exists():
+            return
+        subprocess.run(
+            ["certutil", "-d", f"sql:{profile_dir}", "-N", "--empty-password"],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+
+    def list_nss_certs(self, profile_dir: Path) -> set[str]:
+        result = subprocess.run(
+            ["certutil", "-d", f"sql:{profile_dir}", "-L"],
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return set()
+        aliases = set()
+        for line in result.stdout.splitlines():
+            line = line.strip()
+            if not line or line.startswith("Certificate Nickname"):
+                continue
+            parts = line.split()
+            if parts:
+                aliases.add(parts[0])
+        return aliases
+
+    def import_nss_cert(self, profile_dir: Path, alias: str, cert_path: Path, trust: str) -> None:
+        subprocess.run(
+            [
+                "certutil",
+                "-d",
+                f"sql:{profile_dir}",
+                "-A",
+                "-t",
+                trust,
+                "-n",
+                alias,
+                "-i",
+                str(cert_path),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+
+    def window_handles(self) -> list[str]:
+        if self.driver is None:
+            return []
+        with self.lock, suppress(WebDriverException):
+            return self.driver.window_handles
+        return []
+
+    def current_handle(self) -> str | None:
+        if self.driver is None:
+            return None
+        with self.lock:
+            try:
+                return self.driver.current_window_handle
+            except WebDriverException:
+                handles = self.driver.window_handles
+                return handles[0] if handles else None
+
+    def focus(self, handle: str):
+        with self.lock:
+            if self.focused_handle != handle:
+                try:
+                    self.driver.switch_to.window(handle)
+                except WebDriverException:
+                    self.focused_handle = None
+                    raise
+                self.focused_handle = handle
+            return FocusedDriver(self, self.driver)
+
+    def forget_handle(self, handle: str) -> None:
+        if self.focused_handle == handle:
+            self.focused_handle = None
+        with self.session_lock:
+            self.sessions.pop(self.target_of(handle), None)
+
+    def quit(self) -> None:
+        if self.cdp is not None:
+            self.cdp.close()
+            self.cdp = None
+        with self.lock, suppress(Exception):
+            if self.driver is not None:
+                self.driver.quit()
+        self.driver = None
+        self.focused_handle = None
+        if self.profile_dir is not None:
+            with suppress(Exception):
+                shutil.rmtree(self.profile_dir)
+            self.profile_dir = None
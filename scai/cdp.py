@@ -0,0 +1,115 @@
+import itertools
+import json
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from contextlib import suppress
+from urllib.request import urlopen
+
+import websocket
+
+CDP_TIMEOUT = 30.0
+
+Listener = Callable[[dict, str | None], None]
+
+
+class CdpError(RuntimeError):
+    pass
+
+
+def browser_websocket_url(debugger_address: str, timeout: float = 5) -> str:
+    with urlopen(f"http://{debugger_address}/json/version", timeout=timeout) as response:
+        info = json.loads(response.read().decode("utf-8"))
+    return info["webSocketDebuggerUrl"]
+
+
+class CdpConnection:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.socket = None
+        self.sequence = itertools.count(1)
+        self.pending: dict[int, Future] = {}
+        self.listeners: dict[str, list[Listener]] = {}
+        self.events: queue.Queue = queue.Queue()
+        self.send_lock = threading.Lock()
+        self.closed = threading.Event()
+        self.on_close: Callable[[], None] | None = None
+
+    def open(self) -> "CdpConnection":
+        self.socket = websocket.create_connection(self.url, timeout=10, suppress_origin=True)
+        self.socket.settimeout(None)
+        threading.Thread(target=self.read_loop, name="cdp-reader", daemon=True).start()
+        threading.Thread(target=self.dispatch_loop, name="cdp-events", daemon=True).start()
+        return self
+
+    def on(self, method: str, listener: Listener) -> None:
+        self.listeners.setdefault(method, []).append(listener)
+
+    def send(self, method: str, params: dict | None = None, session_id: str | None = None) -> Future:
+        future: Future = Future()
+        if self.closed.is_set():
+            future.set_exception(CdpError("devtools connection closed"))
+            return future
+        message_id = next(self.sequence)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        self.pending[message_id] = future
+        try:
+            with self.send_lock:
+                self.socket.send(json.dumps(message))
+        except Exception as exc:
+            self.pending.pop(message_id, None)
+            future.set_exception(CdpError(str(exc)))
+        return future
+
+    def call(
+        self,
+        method: str,
+        params: dict | None = None,
+        session_id: str | None = None,
+        timeout: float = CDP_TIMEOUT,
+    ) -> dict:
+        return self.send(method, params, session_id).result(timeout)
+
+    def read_loop(self) -> None:
+        try:
+            while True:
+                message = json.loads(self.socket.recv())
+                if "id" in message:
+                    future = self.pending.pop(message["id"], None)
+                    if future is None:
+                        continue
+                    if "error" in message:
+                        future.set_exception(CdpError(message["error"].get("message", "devtools error")))
+                    else:
+                        future.set_result(message.get("result") or {})
+                elif "method" in message:
+                    self.events.put(message)
+        except Exception:
+            pass
+        finally:
+            self.closed.set()
+            for message_id in list(self.pending):
+                future = self.pending.pop(message_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(CdpError("devtools connection closed"))
+            self.events.put(None)
+
+    def dispatch_loop(self) -> None:
+        while True:
+            message = self.events.get()
+            if message is None:
+                break
+            for listener in list(self.listeners.get(message["method"], ())):
+                with suppress(Exception):
+                    listener(message.get("params") or {}, message.get("sessionId"))
+        if self.on_close is not None:
+            with suppress(Exception):
+                self.on_close()
+
+    def close(self) -> None:
+        self.on_close = None
+        with suppress(Exception):
+            self.socket.close()
@@ -1,13 +1,13 @@
 import argparse
 import json
 import os
-import shutil
-import socket
-import subprocess
 import sys
 import time
+from collections.abc import Iterator
+from pathlib import Path
 
-from .config import BASE_DIR, HOST, PID_PATH, PORT, RUNTIME_DIR
+from .config import BASE_DIR, PID_PATH, PROTOCOL, RUNTIME_DIR, SERVICE_ADDRESS, TIMING
+from .protocol import READY_FD_ENV, ServiceClient, connect, read_ready, read_timeout, send_oneshot
 
 
 ALIAS_MAP = {
@@ -28,18 +28,33 @@ ALIAS_MAP = {
     "online": ["network", "set", "online"],
 }
 
+PING_TIMEOUT = 5.0
+
+_connection: ServiceClient | None = None
+_timings: list[dict] | None = None
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(prog="scai")
-    sub = parser.add_subparsers(dest="group", required=True)
 
-    svc = sub.add_parser("service")
+def parse_clip(value: str) -> dict:
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != 4:
+        raise argparse.ArgumentTypeError("clip must be x,y,width,height")
+    return dict(zip(("x", "y", "width", "height"), parts))
+
+
+def add_service_parser(svc: argparse.ArgumentParser) -> None:
     svc_sub = svc.add_subparsers(dest="action", required=True)
-    svc_sub.add_parser("start")
+    svc_start = svc_sub.add_parser("start")
+    svc_start.add_argument("--workers", type=int)
+    svc_start.add_argument("--pool", type=int)
+    svc_start.add_argument("--standby", action="store_true")
     svc_sub.add_parser("stop")
     svc_sub.add_parser("status")
+    svc_metrics = svc_sub.add_parser("metrics")
+    svc_metrics.add_argument("--format", choices=["json", "prometheus"], default="json")
+    svc_metrics.add_argument("--reset", action="store_true")
+
 
-    tab = sub.add_parser("tab")
+def add_tab_parser(tab: argparse.ArgumentParser) -> None:
     tab_sub = tab.add_subparsers(dest="action", required=True)
     tab_sub.add_parser("open")
     tab_sub.add_parser("list")
@@ -47,10 +62,15 @@ def build_parser() -> argparse.ArgumentParser:
     focus.add_argument("tab")
     close = tab_sub.add_parser("close")
     close.add_argument("tab")
+    close.add_argument("--recycle", action="store_true", default=None)
     info = tab_sub.add_parser("info")
     info.add_argument("tab", nargs="?")
+    tab_sub.add_parser("memory")
+
+
+def add_nav_parser(nav: argparse.ArgumentParser) -> None:
+    from .pageload import WAIT_STRATEGIES
 
-    nav = sub.add_parser("nav")
     nav_sub = nav.add_subparsers(dest="action", required=True)
     go = nav_sub.add_parser("go")
     go.add_argument("url")
@@ -61,46 +81,173 @@ def build_parser() -> argparse.ArgumentParser:
     back_cmd.add_argument("--tab")
     forward_cmd = nav_sub.add_parser("forward")
     forward_cmd.add_argument("--tab")
+    for nav_cmd in (go, reload_cmd, back_cmd, forward_cmd):
+        nav_cmd.add_argument("--wait", choices=list(WAIT_STRATEGIES))
+        nav_cmd.add_argument("--selector")
+        nav_cmd.add_argument("--predicate")
+        nav_cmd.add_argument("--timeout", type=float)
+        nav_cmd.add_argument("--idle-ms", type=int)
+
 
-    page = sub.add_parser("page")
+def add_page_parser(page: argparse.ArgumentParser) -> None:
     page_sub = page.add_subparsers(dest="action", required=True)
     title_cmd = page_sub.add_parser("title")
     title_cmd.add_argument("--tab")
     url_cmd = page_sub.add_parser("url")
     url_cmd.add_argument("--tab")
+    perf_cmd = page_sub.add_parser("perf")
+    perf_cmd.add_argument("--tab")
+    perf_cmd.add_argument("--all", action="store_true")
+    perf_cmd.add_argument("--tabs", type=lambda value: [item for item in value.split(",") if item])
 
-    logs = sub.add_parser("logs")
+
+def add_logs_parser(logs: argparse.ArgumentParser) -> None:
     logs_sub = logs.add_subparsers(dest="action", required=True)
-    logs_sub.add_parser("read")
+    logs_read = logs_sub.add_parser("read")
+    logs_read.add_argument("--cursor", type=int)
+    logs_read.add_argument("--limit", type=int)
+    logs_read.add_argument("--json", action="store_true")
+    logs_follow = logs_sub.add_parser("follow")
+    logs_follow.add_argument("--cursor", type=int)
+    for logs_cmd in (logs_read, logs_follow):
+        logs_cmd.add_argument("--level")
+        logs_cmd.add_argument("--tab")
+        logs_cmd.add_argument("--grep")
     logs_sub.add_parser("clear")
 
-    cache = sub.add_parser("cache")
+
+def add_cache_parser(cache: argparse.ArgumentParser) -> None:
     cache_sub = cache.add_subparsers(dest="action", required=True)
     cache_sub.add_parser("clear")
+    cache_mode = cache_sub.add_parser("mode")
+    cache_mode.add_argument("mode", choices=["off", "record", "replay"])
+    cache_mode.add_argument("--strict", action="store_true")
+    cache_sub.add_parser("stats")
+    cache_sub.add_parser("purge")
 
-    storage = sub.add_parser("storage")
+
+def add_storage_parser(storage: argparse.ArgumentParser) -> None:
     storage_sub = storage.add_subparsers(dest="action", required=True)
     storage_clear = storage_sub.add_parser("clear")
     storage_clear.add_argument("--tab")
 
-    network = sub.add_parser("network")
+
+def add_network_parser(network: argparse.ArgumentParser) -> None:
     net_sub = network.add_subparsers(dest="action", required=True)
     net_set = net_sub.add_parser("set")
     net_set.add_argument("profile")
     net_sub.add_parser("reset")
-
-    script = sub.add_parser("script")
+    net_record = net_sub.add_parser("record")
+    net_record.add_argument("state", choices=["start", "stop"])
+    net_record.add_argument("--tab")
+    net_record.add_argument("--events")
+    net_record.add_argument("--har")
+    net_block = net_sub.add_parser("block")
+    net_block.add_argument("state", choices=["set", "clear"])
+    net_block.add_argument("--tab")
+    net_block.add_argument("--type", dest="types", action="append")
+    net_block.add_argument("--pattern", dest="patterns", action="append")
+    net_block.add_argument("--light", action="store_true")
+
+
+def add_trace_parser(trace: argparse.ArgumentParser) -> None:
+    trace.add_argument("state", choices=["start", "stop"])
+    trace.add_argument("--tab")
+    trace.add_argument("--path")
+    trace.add_argument("--categories", type=lambda value: [item for item in value.split(",") if item])
+
+
+def add_profile_parser(profile: argparse.ArgumentParser) -> None:
+    profile.add_argument("state", choices=["start", "stop"])
+    profile.add_argument("--tab")
+    profile.add_argument("--path")
+    profile.add_argument("--interval", type=int)
+
+
+def add_script_parser(script: argparse.ArgumentParser) -> None:
     script_sub = script.add_subparsers(dest="action", required=True)
     script_run = script_sub.add_parser("run")
     script_run.add_argument("code")
     script_run.add_argument("--tab")
 
-    shot = sub.add_parser("snapshot")
+
+def add_snapshot_parser(shot: argparse.ArgumentParser) -> None:
     shot_sub = shot.add_subparsers(dest="action", required=True)
     shot_save = shot_sub.add_parser("save")
     shot_save.add_argument("--tab")
     shot_save.add_argument("--path")
+    shot_save.add_argument("--format", choices=["png", "jpeg", "jpg", "webp"])
+    shot_save.add_argument("--quality", type=int)
+    shot_save.add_argument("--clip", type=parse_clip)
+    shot_save.add_argument("--selector")
+    shot_save.add_argument("--scale", type=float)
+    shot_save.add_argument("--full-page", action="store_true")
+    shot_save.add_argument("--stdout", action="store_true")
+    shot_all = shot_sub.add_parser("all")
+    shot_all.add_argument("--tabs", type=lambda value: [item for item in value.split(",") if item])
+    shot_all.add_argument("--dir")
+    shot_all.add_argument("--format", choices=["png", "jpeg", "jpg", "webp"])
+    shot_all.add_argument("--quality", type=int)
+    shot_all.add_argument("--scale", type=float)
+    shot_all.add_argument("--full-page", action="store_true")
+    shot_all.add_argument("--inline", action="store_true")
+
+
+def add_batch_parser(batch: argparse.ArgumentParser) -> None:
+    batch.add_argument("file", nargs="?")
+    batch.add_argument("--continue-on-error", action="store_true")
+
+
+def add_crawl_parser(crawl: argparse.ArgumentParser) -> None:
+    from .crawl import CRAWL_ACTIONS
+    from .pageload import WAIT_STRATEGIES
+
+    crawl.add_argument("file", nargs="?")
+    crawl.add_argument("--concurrency", type=int, default=4)
+    crawl.add_argument("--action", dest="actions", action="append", choices=sorted(CRAWL_ACTIONS))
+    crawl.add_argument("--script")
+    crawl.add_argument("--spec")
+    crawl.add_argument("--screenshot-dir")
+    crawl.add_argument("--wait", choices=list(WAIT_STRATEGIES))
+    crawl.add_argument("--timeout", type=float)
+    crawl.add_argument("--output")
+    crawl.add_argument("--checkpoint")
+    crawl.add_argument("--quiet", action="store_true")
+
+
+PARSER_GROUPS = {
+    "service": add_service_parser,
+    "tab": add_tab_parser,
+    "nav": add_nav_parser,
+    "page": add_page_parser,
+    "logs": add_logs_parser,
+    "cache": add_cache_parser,
+    "storage": add_storage_parser,
+    "network": add_network_parser,
+    "trace": add_trace_parser,
+    "profile": add_profile_parser,
+    "script": add_script_parser,
+    "snapshot": add_snapshot_parser,
+    "batch": add_batch_parser,
+    "crawl": add_crawl_parser,
+}
+
 
+def requested_group(argv: list[str]) -> str | None:
+    for token in argv[1:]:
+        if not token.startswith("-"):
+            return token if token in PARSER_GROUPS else None
+    return None
+
+
+def build_parser(group: str | None = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="scai")
+    parser.add_argument("--timing", action="store_true", default=TIMING)
+    sub = parser.add_subparsers(dest="group", required=True)
+    for name, add_group in PARSER_GROUPS.items():
+        group_parser = sub.add_parser(name)
+        if group in (None, name):
+            add_group(group_parser)
     return parser
 
 
@@ -115,13 +262,15 @@ def apply_aliases(argv: list[str]) -> list[str]:
 
 def is_service_ready() -> bool:
     try:
-        send_command({"command": "ping"}, auto_start=False)
+        send_command({"command": "ping"}, auto_start=False, timeout=PING_TIMEOUT)
         return True
     except Exception:
         return False
 
 
-def start_service() -> None:
+def start_service() -> int:
+    import subprocess
+
     RUNTIME_DIR.mkdir(parents=True, exist_ok=True)
     log_path = RUNTIME_DIR / "service.log"
     cmd = [sys.executable, "-m", "scai.service"]
@@ -130,34 +279,54 @@ def start_service() -> None:
         env["PYTHONPATH"] = f"{BASE_DIR.parent}:{env['PYTHONPATH']}"
     else:
         env["PYTHONPATH"] = str(BASE_DIR.parent)
-    with log_path.open("ab") as log_file:
-        subprocess.Popen(
-            cmd,
-            stdout=log_file,
-            stderr=log_file,
-            cwd=str(BASE_DIR.parent),
-            env=env,
-        )
+    ready_fd, write_fd = os.pipe()
+    env[READY_FD_ENV] = str(write_fd)
+    try:
+        with log_path.open("ab") as log_file:
+            subprocess.Popen(
+                cmd,
+                stdout=log_file,
+                stderr=log_file,
+                cwd=str(BASE_DIR.parent),
+                env=env,
+                pass_fds=(write_fd,),
+            )
+    except Exception:
+        os.close(ready_fd)
+        raise
+    finally:
+        os.close(write_fd)
+    return ready_fd
 
 
-def wait_for_service(timeout: float = 15.0) -> None:
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            send_command({"command": "ping"}, auto_start=False)
-            return
-        except Exception:
-            time.sleep(0.2)
-            continue
-        time.sleep(0.2)
-    raise RuntimeError("service did not start")
+def log_tail(path: Path, count: int = 5) -> str:
+    try:
+        lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return ""
+    return "\n".join(lines[-count:])
+
+
+def wait_for_service(ready_fd: int, timeout: float = 15.0) -> None:
+    try:
+        message = read_ready(ready_fd, timeout)
+    finally:
+        os.close(ready_fd)
+    if message is None:
+        raise RuntimeError(f"service did not become ready within {timeout:g}s")
+    if message.get("status") == "ready" or is_service_ready():
+        return
+    if not message:
+        tail = log_tail(RUNTIME_DIR / "service.log")
+        raise RuntimeError(f"service exited during startup\n{tail}".rstrip())
+    error = f"service failed to start: {message.get('error')}: {message.get('message')}"
+    raise RuntimeError("\n".join([error, *message.get("detail", [])]))
 
 
 def ensure_service() -> None:
     if is_service_ready():
         return
-    start_service()
-    wait_for_service()
+    wait_for_service(start_service())
 
 
 def wait_for_shutdown(timeout: float = 5.0) -> None:
@@ -169,27 +338,59 @@ def wait_for_shutdown(timeout: float = 5.0) -> None:
 
 
 def cleanup_runtime() -> None:
+    import shutil
+
     if RUNTIME_DIR.exists():
         shutil.rmtree(RUNTIME_DIR, ignore_errors=True)
 
 
-def send_command(payload: dict, auto_start: bool = True) -> dict:
+def service_connection() -> ServiceClient:
+    global _connection
+    if _connection is None:
+        started = time.perf_counter()
+        _connection = connect(SERVICE_ADDRESS)
+        if _timings is not None:
+            _timings.append({"connect_ms": round((time.perf_counter() - started) * 1000, 3)})
+    return _connection
+
+
+def close_connection() -> None:
+    global _connection
+    if _connection is not None:
+        _connection.close()
+        _connection = None
+
+
+def exchange(payload: dict, timeout: float | None = None) -> dict:
+    if timeout is None:
+        timeout = read_timeout(payload)
+    if _timings is not None:
+        payload = {**payload, "timing": True}
+    started = time.perf_counter()
+    if PROTOCOL == "oneshot":
+        response = send_oneshot(SERVICE_ADDRESS, payload, timeout)
+    else:
+        try:
+            response = service_connection().request(payload, timeout)
+        except Exception:
+            close_connection()
+            raise
+    if _timings is not None:
+        round_trip = (time.perf_counter() - started) * 1000
+        server = response.get("timing") or {}
+        entry = {"command": payload.get("command"), "round_trip_ms": round(round_trip, 3), **server}
+        if server:
+            entry["transfer_ms"] = round(round_trip - server["wait_ms"] - server["exec_ms"], 3)
+        _timings.append(entry)
+    return response
+
+
+def send_command(payload: dict, auto_start: bool = True, timeout: float | None = None) -> dict:
     attempts = 2 if auto_start else 1
     last_error = None
     for index in range(attempts):
         try:
-            with socket.create_connection((HOST, PORT), timeout=10) as client:
-                client.sendall(json.dumps(payload).encode("utf-8"))
-                client.shutdown(socket.SHUT_WR)
-                data = bytearray()
-                while True:
-                    chunk = client.recv(4096)
-                    if not chunk:
-                        break
-                    data.extend(chunk)
-            if not data:
-                raise RuntimeError("empty response")
-            response = json.loads(data.decode("utf-8"))
+            response = exchange(payload, timeout)
             if response.get("status") != "ok":
                 raise RuntimeError(response.get("message") or "command failed")
             return response.get("result") or {}
@@ -202,24 +403,54 @@ def send_command(payload: dict, auto_start: bool = True) -> dict:
     raise last_error
 
 
+def stream_command(payload: dict, timeout: float | None = None) -> Iterator[dict]:
+    if PROTOCOL == "oneshot":
+        result = send_command(payload)
+        yield from result.pop("results", [])
+        yield result
+        return
+    ensure_service()
+    try:
+        for message in service_connection().stream(payload, timeout):
+            if message.get("status") != "ok":
+                raise RuntimeError(message.get("message") or "command failed")
+            yield message.get("result") or {}
+    except (OSError, ValueError):
+        close_connection()
+        raise
+
+
 def handle_service(args: argparse.Namespace) -> None:
     if args.action == "start":
+        if args.workers:
+            os.environ["SCAI_WORKERS"] = str(args.workers)
+        if args.pool is not None:
+            os.environ["SCAI_TAB_POOL"] = str(args.pool)
+        if args.standby:
+            os.environ["SCAI_STANDBY"] = "1"
         ensure_service()
         print("service ready")
     elif args.action == "stop":
         try:
-            send_command({"command": "service-stop"})
+            send_command({"command": "service-stop"}, auto_start=False)
             wait_for_shutdown()
-            cleanup_runtime()
             print("service stopped")
         except Exception as exc:
             print(str(exc))
+        finally:
+            cleanup_runtime()
     elif args.action == "status":
         try:
             result = send_command({"command": "service-status"})
             print(json.dumps(result, indent=2))
         except Exception as exc:
             print(str(exc))
+    elif args.action == "metrics":
+        result = send_command({"command": "service-metrics", "format": args.format, "reset": args.reset})
+        if args.format == "prometheus":
+            print(result.get("text", ""), end="")
+        else:
+            print(json.dumps(result, indent=2))
 
 
 def handle_tab(args: argparse.Namespace) -> None:
@@ -230,32 +461,37 @@ def handle_tab(args: argparse.Namespace) -> None:
         result = send_command({"command": "tabs-list"})
         for entry in result.get("tabs", []):
             prefix = "*" if entry.get("active") else "-"
-            print(f"{prefix} {entry.get('id')} {entry.get('title', '')} {entry.get('url', '')}")
+            state = f" [{entry['state']}]" if entry.get("state") else ""
+            print(f"{prefix} {entry.get('id')}{state} {entry.get('title', '')} {entry.get('url', '')}")
     elif args.action == "focus":
         result = send_command({"command": "tabs-focus", "tab": args.tab})
         print(result.get("tab"))
     elif args.action == "close":
-        result = send_command({"command": "tabs-close", "tab": args.tab})
+        result = send_command({"command": "tabs-close", "tab": args.tab, "recycle": args.recycle})
         print(result.get("closed"))
     elif args.action == "info":
         result = send_command({"command": "page-url", "tab": args.tab})
         detail = send_command({"command": "page-title", "tab": args.tab})
         print(json.dumps({"url": result.get("url"), "title": detail.get("title")}, indent=2))
+    elif args.action == "memory":
+        result = send_command({"command": "tabs-memory"})
+        print(json.dumps(result, indent=2))
 
 
 def handle_nav(args: argparse.Namespace) -> None:
+    payload = {
+        "command": f"nav-{args.action}",
+        "tab": args.tab,
+        "wait": args.wait,
+        "selector": args.selector,
+        "predicate": args.predicate,
+        "timeout": args.timeout,
+        "idle_ms": args.idle_ms,
+    }
     if args.action == "go":
-        result = send_command({"command": "nav-go", "url": args.url, "tab": args.tab})
-        print(result.get("url"))
-    elif args.action == "reload":
-        result = send_command({"command": "nav-reload", "tab": args.tab})
-        print(result.get("url"))
-    elif args.action == "back":
-        result = send_command({"command": "nav-back", "tab": args.tab})
-        print(result.get("url"))
-    elif args.action == "forward":
-        result = send_command({"command": "nav-forward", "tab": args.tab})
-        print(result.get("url"))
+        payload["url"] = args.url
+    result = send_command(payload)
+    print(result.get("url"))
 
 
 def handle_page(args: argparse.Namespace) -> None:
@@ -265,17 +501,42 @@ def handle_page(args: argparse.Namespace) -> None:
     elif args.action == "url":
         result = send_command({"command": "page-url", "tab": args.tab})
         print(result.get("url"))
+    elif args.action == "perf":
+        if args.all or args.tabs:
+            result = send_command({"command": "page-perf-all", "tabs": args.tabs})
+        else:
+            result = send_command({"command": "page-perf", "tab": args.tab})
+        print(json.dumps(result, indent=2))
+
+
+def format_log_entry(item: dict) -> str:
+    level = item.get("level")
+    ts = item.get("timestamp")
+    message = item.get("message")
+    return f"{ts} {level} {message}"
+
+
+def log_filters(args: argparse.Namespace) -> dict:
+    return {"level": args.level, "tab": args.tab, "pattern": args.grep, "cursor": args.cursor}
 
 
 def handle_logs(args: argparse.Namespace) -> None:
     if args.action == "read":
-        result = send_command({"command": "console-read"})
+        payload = {"command": "console-read", **log_filters(args), "limit": args.limit}
+        result = send_command(payload)
+        if args.json:
+            print(json.dumps(result, indent=2))
+            return
         entries = result.get("entries", [])
         for item in entries:
-            level = item.get("level")
-            ts = item.get("timestamp")
-            message = item.get("message")
-            print(f"{ts} {level} {message}")
+            print(format_log_entry(item))
+    elif args.action == "follow":
+        try:
+            for item in stream_command({"command": "console-follow", **log_filters(args)}):
+                if "entry" in item:
+                    print(format_log_entry(item["entry"]), flush=True)
+        except KeyboardInterrupt:
+            pass
     elif args.action == "clear":
         send_command({"command": "console-clear"})
         print("cleared")
@@ -285,6 +546,15 @@ def handle_cache(args: argparse.Namespace) -> None:
     if args.action == "clear":
         send_command({"command": "cache-clear"})
         print("cleared")
+    elif args.action == "mode":
+        result = send_command({"command": "cache-mode", "mode": args.mode, "strict": args.strict})
+        print(result.get("mode"))
+    elif args.action == "stats":
+        result = send_command({"command": "cache-stats"})
+        print(json.dumps(result, indent=2))
+    elif args.action == "purge":
+        result = send_command({"command": "cache-purge"})
+        print(result.get("removed"))
 
 
 def handle_storage(args: argparse.Namespace) -> None:
@@ -300,6 +570,45 @@ def handle_network(args: argparse.Namespace) -> None:
     elif args.action == "reset":
         result = send_command({"command": "network-reset"})
         print(result.get("profile"))
+    elif args.action == "record":
+        if args.state == "start":
+            result = send_command({"command": "network-record-start", "tab": args.tab, "path": args.events})
+            print(result.get("events"))
+        else:
+            result = send_command({"command": "network-record-stop", "tab": args.tab, "har": args.har})
+            print(result.get("path"))
+    elif args.action == "block":
+        if args.state == "set":
+            payload = {
+                "command": "network-block",
+                "tab": args.tab,
+                "types": args.types,
+                "patterns": args.patterns,
+                "preset": "light" if args.light else None,
+            }
+            result = send_command(payload)
+            print(json.dumps(result, indent=2))
+        else:
+            result = send_command({"command": "network-unblock", "tab": args.tab})
+            print(result.get("cleared"))
+
+
+def handle_trace(args: argparse.Namespace) -> None:
+    if args.state == "start":
+        payload = {"command": "trace-start", "tab": args.tab, "path": args.path, "categories": args.categories}
+    else:
+        payload = {"command": "trace-stop", "tab": args.tab}
+    result = send_command(payload)
+    print(result.get("path"))
+
+
+def handle_profile(args: argparse.Namespace) -> None:
+    if args.state == "start":
+        payload = {"command": "profile-start", "tab": args.tab, "path": args.path, "interval_us": args.interval}
+    else:
+        payload = {"command": "profile-stop", "tab": args.tab}
+    result = send_command(payload)
+    print(result.get("path"))
 
 
 def handle_script(args: argparse.Namespace) -> None:
@@ -314,15 +623,117 @@ def handle_script(args: argparse.Namespace) -> None:
 
 def handle_snapshot(args: argparse.Namespace) -> None:
     if args.action == "save":
-        result = send_command({"command": "screenshot", "tab": args.tab, "path": args.path})
-        print(result.get("path"))
+        payload = {
+            "command": "screenshot",
+            "tab": args.tab,
+            "path": args.path,
+            "format": args.format,
+            "quality": args.quality,
+            "clip": args.clip,
+            "selector": args.selector,
+            "scale": args.scale,
+            "full_page": args.full_page,
+            "inline": args.stdout,
+        }
+        result = send_command(payload)
+        if args.stdout:
+            import base64
+
+            sys.stdout.buffer.write(base64.b64decode(result.get("data") or ""))
+            sys.stdout.buffer.flush()
+        else:
+            print(result.get("path"))
+    elif args.action == "all":
+        payload = {
+            "command": "screenshot-all",
+            "tabs": args.tabs,
+            "dir": args.dir,
+            "format": args.format,
+            "quality": args.quality,
+            "scale": args.scale,
+            "full_page": args.full_page,
+            "inline": args.inline,
+        }
+        result = send_command(payload)
+        print(json.dumps(result, indent=2))
+        if result.get("failed"):
+            raise RuntimeError(f"{result['failed']} screenshot(s) failed")
+
+
+def handle_batch(args: argparse.Namespace) -> None:
+    from .batch import parse_steps
+
+    if args.file in (None, "-"):
+        text = sys.stdin.read()
+    else:
+        text = Path(args.file).read_text(encoding="utf-8")
+    steps, options = parse_steps(text)
+    payload = {"command": "batch", "steps": steps, **options}
+    if args.continue_on_error:
+        payload["continue_on_error"] = True
+    failed = 0
+    for item in stream_command(payload, read_timeout(payload)):
+        print(json.dumps(item), flush=True)
+        if "index" not in item:
+            failed = item.get("failed", 0)
+    if failed:
+        raise RuntimeError(f"{failed} batch step(s) failed")
+
+
+def crawl_steps(args: argparse.Namespace) -> list[dict]:
+    from .batch import parse_steps
+    from .crawl import CRAWL_ACTIONS
+
+    steps = []
+    for action in args.actions or []:
+        step = dict(CRAWL_ACTIONS[action])
+        if action == "screenshot" and args.screenshot_dir:
+            Path(args.screenshot_dir).mkdir(parents=True, exist_ok=True)
+            step["path"] = str(Path(args.screenshot_dir) / "${index}.png")
+        steps.append(step)
+    if args.script:
+        steps.append({"command": "script-run", "name": "script", "script": args.script})
+    if args.spec:
+        spec_steps, _options = parse_steps(Path(args.spec).read_text(encoding="utf-8"))
+        steps.extend(spec_steps)
+    return steps
+
+
+def handle_crawl(args: argparse.Namespace) -> None:
+    from .crawl import Crawler, read_urls
+
+    if args.file in (None, "-"):
+        urls = read_urls(sys.stdin)
+    else:
+        urls = read_urls(Path(args.file).read_text(encoding="utf-8").splitlines())
+    ensure_service()
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        crawler = Crawler(
+            service_connection(),
+            crawl_steps(args),
+            args.concurrency,
+            output,
+            progress=None if args.quiet else sys.stderr,
+            checkpoint=Path(args.checkpoint) if args.checkpoint else None,
+            wait=args.wait,
+            timeout=args.timeout,
+        )
+        summary = crawler.run(urls)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    if not args.quiet:
+        print(f"crawl: {json.dumps(summary)}", file=sys.stderr)
 
 
 def main(argv: list[str] | None = None) -> int:
     argv = argv or sys.argv
     argv = apply_aliases(argv)
-    parser = build_parser()
+    parser = build_parser(requested_group(argv))
     args = parser.parse_args(argv[1:])
+    global _timings
+    _timings = [] if args.timing else None
     try:
         if args.group == "service":
             handle_service(args)
@@ -342,12 +753,24 @@ def main(argv: list[str] | None = None) -> int:
             handle_network(args)
         elif args.group == "script":
             handle_script(args)
+        elif args.group == "trace":
+            handle_trace(args)
+        elif args.group == "profile":
+            handle_profile(args)
         elif args.group == "snapshot":
             handle_snapshot(args)
+        elif args.group == "batch":
+            handle_batch(args)
+        elif args.group == "crawl":
+            handle_crawl(args)
         return 0
     except Exception as exc:
         print(str(exc), file=sys.stderr)
         return 1
+    finally:
+        close_connection()
+        for entry in _timings or []:
+            print(f"timing: {json.dumps(entry)}", file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -7,3 +8,23 @@ LOG_PATH = RUNTIME_DIR / "driver.log"
 STATE_PATH = RUNTIME_DIR / "state.json"
 HOST = "127.0.0.1"
 PORT = 48251
+SOCKET_PATH = Path(os.environ.get("SCAI_SOCKET", RUNTIME_DIR / "scai.sock"))
+TRANSPORT = os.environ.get("SCAI_TRANSPORT", "unix")
+SERVICE_ADDRESS = (HOST, PORT) if TRANSPORT == "tcp" else str(SOCKET_PATH)
+CHROME_BINARY = os.environ.get("SCAI_CHROME_BINARY")
+WORKER_COUNT = max(1, int(os.environ.get("SCAI_WORKERS", "1")))
+TAB_POOL_SIZE = max(0, int(os.environ.get("SCAI_TAB_POOL", "0")))
+TAB_POOL_RECYCLE = os.environ.get("SCAI_TAB_POOL_RECYCLE") == "1"
+TAB_FREEZE_IDLE = float(os.environ.get("SCAI_TAB_FREEZE_IDLE", "0"))
+TAB_DISCARD_IDLE = float(os.environ.get("SCAI_TAB_DISCARD_IDLE", "0"))
+MAX_LIVE_TABS = max(0, int(os.environ.get("SCAI_MAX_LIVE_TABS", "0")))
+JS_HEAP_CEILING = max(0, int(os.environ.get("SCAI_JS_HEAP_CEILING_MB", "0"))) * 1024 * 1024
+TAB_POLICY_INTERVAL = float(os.environ.get("SCAI_TAB_POLICY_INTERVAL", "5"))
+WATCHDOG_INTERVAL = float(os.environ.get("SCAI_WATCHDOG_INTERVAL", "0"))
+STANDBY_BROWSER = os.environ.get("SCAI_STANDBY") == "1"
+CONSOLE_BUFFER_SIZE = int(os.environ.get("SCAI_CONSOLE_BUFFER", "5000"))
+PROTOCOL = os.environ.get("SCAI_PROTOCOL", "framed")
+MAX_INFLIGHT = max(1, int(os.environ.get("SCAI_MAX_INFLIGHT", "32")))
+TIMING = os.environ.get("SCAI_TIMING") == "1"
+HTTP_CACHE_DIR = Path(os.environ.get("SCAI_HTTP_CACHE_DIR", BASE_DIR / "httpcache"))
+HTTP_CACHE_LIMIT = int(os.environ.get("SCAI_HTTP_CACHE_MB", "512")) * 1024 * 1024
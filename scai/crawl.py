@@ -0,0 +1,192 @@
+import json
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TextIO
+
+from .protocol import ServiceClient
+
+CRAWL_ACTIONS = {
+    "title": {"command": "page-title", "name": "title"},
+    "url": {"command": "page-url", "name": "url"},
+    "screenshot": {"command": "screenshot", "name": "screenshot"},
+}
+PROGRESS_INTERVAL = 1.0
+
+
+def read_urls(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        url = line.strip()
+        if url and not url.startswith("#"):
+            yield url
+
+
+def load_checkpoint(path: Path | None) -> set[str]:
+    if path is None or not path.exists():
+        return set()
+    return set(read_urls(path.read_text(encoding="utf-8").splitlines()))
+
+
+def substitute(value: object, variables: dict[str, str]) -> object:
+    if isinstance(value, str):
+        for name, replacement in variables.items():
+            value = value.replace(f"${{{name}}}", replacement)
+        return value
+    if isinstance(value, dict):
+        return {key: substitute(item, variables) for key, item in value.items()}
+    if isinstance(value, list):
+        return [substitute(item, variables) for item in value]
+    return value
+
+
+class Crawler:
+    def __init__(
+        self,
+        client: ServiceClient,
+        steps: list[dict],
+        concurrency: int,
+        output: TextIO,
+        progress: TextIO | None = None,
+        checkpoint: Path | None = None,
+        wait: str | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self.client = client
+        self.steps = steps
+        self.concurrency = max(1, concurrency)
+        self.output = output
+        self.progress = progress
+        self.checkpoint = checkpoint
+        self.wait = wait
+        self.timeout = timeout
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.position = 0
+        self.started = time.perf_counter()
+        self.reported = self.started
+
+    def open_tab(self) -> str:
+        response = self.client.request({"command": "tabs-open"})
+        if response.get("status") != "ok":
+            raise RuntimeError(response.get("message") or "tabs-open failed")
+        return response["result"]["tab"]
+
+    def tab_alive(self, tab: str) -> bool:
+        return self.client.request({"command": "page-url", "tab": tab}).get("status") == "ok"
+
+    def close_tab(self, tab: str) -> None:
+        self.client.request({"command": "tabs-close", "tab": tab})
+
+    def batch_payload(self, url: str, tab: str, index: int) -> dict:
+        variables = {"url": url, "index": str(index)}
+        nav = {"command": "nav-go", "name": "nav", "url": url, "tab": tab}
+        if self.wait:
+            nav["wait"] = self.wait
+        if self.timeout:
+            nav["timeout"] = self.timeout
+        steps = [nav]
+        for step in self.steps:
+            step = substitute(step, variables)
+            steps.append({**step, "tab": step.get("tab") or tab})
+        return {"command": "batch", "steps": steps}
+
+    def run(self, urls: Iterable[str]) -> dict:
+        done = load_checkpoint(self.checkpoint)
+        pending = iter(urls)
+        tabs = [self.open_tab() for _ in range(self.concurrency)]
+        free = list(tabs)
+        inflight: dict[int, dict] = {}
+        exhausted = False
+        checkpoint = self.checkpoint.open("a", encoding="utf-8") if self.checkpoint else None
+        try:
+            while True:
+                while free and not exhausted:
+                    url = next(pending, None)
+                    if url is None:
+                        exhausted = True
+                        break
+                    self.position += 1
+                    if url in done:
+                        self.skipped += 1
+                        continue
+                    tab = free.pop()
+                    request_id = self.client.send(self.batch_payload(url, tab, self.position))
+                    inflight[request_id] = {"url": url, "tab": tab, "started": time.perf_counter(), "steps": []}
+                if not inflight:
+                    break
+                message = self.client.receive_any()
+                job = inflight.get(message.get("id"))
+                if job is None:
+                    continue
+                if message.get("stream"):
+                    job["steps"].append(message.get("result") or {})
+                    continue
+                del inflight[message["id"]]
+                record = self.finish(job, message)
+                if record["status"] == "ok" and checkpoint is not None:
+                    checkpoint.write(job["url"] + "\n")
+                    checkpoint.flush()
+                if record["status"] == "ok" or self.tab_alive(job["tab"]):
+                    free.append(job["tab"])
+                else:
+                    tabs.remove(job["tab"])
+                    replacement = self.open_tab()
+                    tabs.append(replacement)
+                    free.append(replacement)
+                self.report_progress()
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            for tab in tabs:
+                try:
+                    self.close_tab(tab)
+                except OSError:
+                    break
+        return self.summary()
+
+    def finish(self, job: dict, message: dict) -> dict:
+        record = {"url": job["url"], "tab": job["tab"], "status": "ok", "results": {}}
+        for report in job["steps"]:
+            key = report.get("name") or report.get("command")
+            if report.get("status") == "ok":
+                record["results"][key] = report.get("result")
+            elif "error" not in record:
+                record["status"] = "error"
+                record["error"] = f"{key}: {report.get('message')}"
+        if message.get("status") != "ok":
+            record["status"] = "error"
+            record["error"] = message.get("message") or "batch failed"
+        record["elapsed_ms"] = round((time.perf_counter() - job["started"]) * 1000, 3)
+        if record["status"] == "ok":
+            self.completed += 1
+        else:
+            self.failed += 1
+        self.output.write(json.dumps(record) + "\n")
+        self.output.flush()
+        return record
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        processed = self.completed + self.failed
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed_s": round(elapsed, 3),
+            "pages_per_s": round(processed / elapsed, 3) if elapsed > 0 else 0.0,
+        }
+
+    def report_progress(self) -> None:
+        if self.progress is None:
+            return
+        now = time.perf_counter()
+        if now - self.reported < PROGRESS_INTERVAL:
+            return
+        self.reported = now
+        summary = self.summary()
+        self.progress.write(
+            f"crawl: {summary['completed']} ok, {summary['failed']} failed, "
+            f"{summary['skipped']} skipped, {summary['pages_per_s']} pages/s\n"
+        )
+        self.progress.flush()
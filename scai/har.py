@@ -0,0 +1,190 @@
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+NETWORK_EVENTS = (
+    "Network.requestWillBeSent",
+    "Network.responseReceived",
+    "Network.dataReceived",
+    "Network.loadingFinished",
+    "Network.loadingFailed",
+)
+
+
+class NetworkRecorder:
+    def __init__(self, tab_id: str, path: Path) -> None:
+        self.tab_id = tab_id
+        self.path = path
+        self.lock = threading.Lock()
+        self.events = 0
+        self.file = path.open("a", encoding="utf-8")
+
+    def record(self, method: str, params: dict) -> None:
+        line = json.dumps({"method": method, "params": params}, separators=(",", ":"))
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.write(line + "\n")
+            self.events += 1
+
+    def close(self) -> None:
+        with self.lock:
+            self.file.close()
+
+
+def header_list(headers: dict | None) -> list[dict]:
+    items = []
+    for name, value in (headers or {}).items():
+        for part in str(value).split("\n"):
+            items.append({"name": name, "value": part})
+    return items
+
+
+def query_list(url: str) -> list[dict]:
+    return [{"name": name, "value": value} for name, value in parse_qsl(urlsplit(url).query, keep_blank_values=True)]
+
+
+def iso_time(wall_time: float | None) -> str:
+    moment = datetime.fromtimestamp(wall_time or 0, tz=timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def segment(start: float, end: float) -> float:
+    if start < 0 or end < 0:
+        return -1
+    return round(end - start, 3)
+
+
+def response_timings(entry: dict) -> dict:
+    timing = (entry.get("response") or {}).get("timing")
+    finished = entry.get("finished_at")
+    if not timing:
+        total = (finished - entry["started_at"]) * 1000 if finished else 0
+        return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0, "wait": round(total, 3), "receive": 0}
+    blocked_end = next(
+        (value for value in (timing["dnsStart"], timing["connectStart"], timing["sendStart"]) if value >= 0),
+        0,
+    )
+    request_offset = (timing["requestTime"] - entry["started_at"]) * 1000
+    receive = 0.0
+    if finished:
+        receive = max(0.0, (finished - timing["requestTime"]) * 1000 - timing["receiveHeadersEnd"])
+    connect = segment(timing["connectStart"], timing["connectEnd"])
+    ssl = segment(timing["sslStart"], timing["sslEnd"])
+    return {
+        "blocked": round(max(0.0, request_offset) + blocked_end, 3),
+        "dns": segment(timing["dnsStart"], timing["dnsEnd"]),
+        "connect": connect,
+        "ssl": ssl,
+        "send": max(0, segment(timing["sendStart"], timing["sendEnd"])),
+        "wait": max(0, segment(timing["sendEnd"], timing["receiveHeadersEnd"])),
+        "receive": round(receive, 3),
+    }
+
+
+def har_entry(entry: dict) -> dict:
+    request = entry["request"]
+    response = entry.get("response") or {}
+    timings = response_timings(entry)
+    total = sum(value for key, value in timings.items() if key != "ssl" and value > 0)
+    post_data = request.get("postData")
+    har_request = {
+        "method": request.get("method", "GET"),
+        "url": request.get("url", ""),
+        "httpVersion": response.get("protocol", "") or "",
+        "headers": header_list(request.get("headers")),
+        "queryString": query_list(request.get("url", "")),
+        "cookies": [],
+        "headersSize": -1,
+        "bodySize": len(post_data.encode("utf-8")) if post_data else 0,
+    }
+    if post_data:
+        content_type = (request.get("headers") or {}).get("Content-Type", "")
+        har_request["postData"] = {"mimeType": content_type, "text": post_data}
+    headers = response.get("headers") or {}
+    har_response = {
+        "status": response.get("status", 0),
+        "statusText": response.get("statusText", "") if not entry.get("failed") else entry["failed"],
+        "httpVersion": response.get("protocol", "") or "",
+        "headers": header_list(headers),
+        "cookies": [],
+        "content": {"size": entry.get("data_length", 0), "mimeType": response.get("mimeType", "")},
+        "redirectURL": headers.get("location") or headers.get("Location") or "",
+        "headersSize": -1,
+        "bodySize": entry.get("encoded_length", -1),
+    }
+    item = {
+        "startedDateTime": iso_time(entry.get("wall_time")),
+        "time": round(total, 3),
+        "request": har_request,
+        "response": har_response,
+        "cache": {},
+        "timings": timings,
+        "_resourceType": entry.get("type", "Other"),
+    }
+    if response.get("remoteIPAddress"):
+        item["serverIPAddress"] = response["remoteIPAddress"]
+    return item
+
+
+def build_har(events_path: Path) -> dict:
+    open_entries: dict[str, dict] = {}
+    entries = []
+    with events_path.open(encoding="utf-8") as events:
+        for line in events:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            method = event["method"]
+            params = event["params"]
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                previous = open_entries.pop(request_id, None)
+                if previous is not None and params.get("redirectResponse"):
+                    previous["response"] = params["redirectResponse"]
+                    previous["finished_at"] = params.get("timestamp")
+                    entries.append(previous)
+                open_entries[request_id] = {
+                    "request": params.get("request") or {},
+                    "type": params.get("type", "Other"),
+                    "started_at": params.get("timestamp", 0),
+                    "wall_time": params.get("wallTime"),
+                    "data_length": 0,
+                }
+                continue
+            entry = open_entries.get(request_id)
+            if entry is None:
+                continue
+            if method == "Network.responseReceived":
+                entry["response"] = params.get("response") or {}
+                entry["type"] = params.get("type", entry["type"])
+            elif method == "Network.dataReceived":
+                entry["data_length"] += params.get("dataLength", 0)
+            elif method == "Network.loadingFinished":
+                entry["finished_at"] = params.get("timestamp")
+                entry["encoded_length"] = params.get("encodedDataLength", -1)
+                entries.append(open_entries.pop(request_id))
+            elif method == "Network.loadingFailed":
+                entry["finished_at"] = params.get("timestamp")
+                entry["failed"] = params.get("errorText", "failed")
+                entries.append(open_entries.pop(request_id))
+    entries.extend(open_entries.values())
+    entries.sort(key=lambda item: item.get("started_at", 0))
+    return {
+        "log": {
+            "version": "1.2",
+            "creator": {"name": "scai", "version": "1.0"},
+            "pages": [],
+            "entries": [har_entry(entry) for entry in entries],
+        }
+    }
+
+
+def write_har(events_path: Path, har_path: Path) -> int:
+    har = build_har(events_path)
+    har_path.parent.mkdir(parents=True, exist_ok=True)
+    with har_path.open("w", encoding="utf-8") as target:
+        json.dump(har, target)
+    return len(har["log"]["entries"])
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import suppress
+from pathlib import Path
+
+CACHE_MODES = ("off", "record", "replay")
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+INDEX_SAVE_INTERVAL = 5.0
+
+
+def request_key(method: str, url: str, body: str | None = None) -> str:
+    digest = hashlib.sha256(f"{method.upper()} {url}".encode("utf-8"))
+    if body:
+        digest.update(b"\0" + body.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def stored_headers(headers: list[dict] | None) -> list[dict]:
+    return [item for item in headers or [] if item.get("name", "").lower() not in SKIPPED_HEADERS]
+
+
+class ResponseStore:
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index_path = root / "index.json"
+        self.entries: dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.dirty = False
+        self.saved_at = time.monotonic()
+        with suppress(OSError, ValueError):
+            self.entries = json.loads(self.index_path.read_text(encoding="utf-8"))
+
+    def object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def get(self, key: str) -> tuple[dict, bytes] | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                try:
+                    content = self.object_path(entry["body"]).read_bytes()
+                except OSError:
+                    self.entries.pop(key, None)
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            entry["used"] = time.time()
+            self.hits += 1
+            self.dirty = True
+            return entry, content
+
+    def put(self, key: str, url: str, status: int, headers: list[dict], content: bytes) -> None:
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        with self.lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                partial = path.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}")
+                partial.write_bytes(content)
+                partial.replace(path)
+            self.entries[key] = {
+                "url": url,
+                "status": status,
+                "headers": stored_headers(headers),
+                "body": digest,
+                "size": len(content),
+                "used": time.time(),
+            }
+            self.stored += 1
+            self.evict()
+            self.dirty = True
+            if time.monotonic() - self.saved_at >= INDEX_SAVE_INTERVAL:
+                self.save()
+
+    def evict(self) -> None:
+        references = Counter(entry["body"] for entry in self.entries.values())
+        sizes = {entry["body"]: entry["size"] for entry in self.entries.values()}
+        total = sum(sizes.values())
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            del self.entries[key]
+            references[entry["body"]] -= 1
+            if references[entry["body"]] == 0:
+                total -= sizes[entry["body"]]
+                with suppress(OSError):
+                    self.object_path(entry["body"]).unlink()
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        partial = self.index_path.with_name(f".index.{os.getpid()}.json")
+        partial.write_text(json.dumps(self.entries), encoding="utf-8")
+        partial.replace(self.index_path)
+        self.dirty = False
+        self.saved_at = time.monotonic()
+
+    def flush(self) -> None:
+        with self.lock:
+            if self.dirty:
+                self.save()
+
+    def clear(self) -> int:
+        with self.lock:
+            removed = len(self.entries)
+            self.entries.clear()
+            for path in (self.root / "objects").glob("*/*"):
+                with suppress(OSError):
+                    path.unlink()
+            self.save()
+        return removed
+
+    def stats(self) -> dict:
+        with self.lock:
+            size = sum({entry["body"]: entry["size"] for entry in self.entries.values()}.values())
+            return {
+                "entries": len(self.entries),
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stored": self.stored,
+            }
@@ -0,0 +1,74 @@
+from fnmatch import fnmatchcase
+
+RESOURCE_TYPES = (
+    "Document",
+    "Stylesheet",
+    "Image",
+    "Media",
+    "Font",
+    "Script",
+    "TextTrack",
+    "XHR",
+    "Fetch",
+    "Prefetch",
+    "EventSource",
+    "WebSocket",
+    "Manifest",
+    "SignedExchange",
+    "Ping",
+    "CSPViolationReport",
+    "Preflight",
+    "Other",
+)
+BLOCK_PRESETS = {
+    "light": {
+        "types": ["Image", "Media", "Font"],
+        "patterns": [
+            "*://*.google-analytics.com/*",
+            "*://*.googletagmanager.com/*",
+            "*://*.doubleclick.net/*",
+            "*://*.facebook.net/*",
+            "*://*.hotjar.com/*",
+            "*://*.segment.io/*",
+        ],
+    },
+}
+
+
+def resource_type(value: str) -> str:
+    for name in RESOURCE_TYPES:
+        if name.lower() == value.lower():
+            return name
+    raise ValueError(f"unknown resource type: {value}")
+
+
+def block_rules(payload: dict) -> dict:
+    types = [resource_type(value) for value in payload.get("types") or []]
+    patterns = list(payload.get("patterns") or [])
+    preset = payload.get("preset")
+    if preset:
+        if preset not in BLOCK_PRESETS:
+            raise ValueError(f"unknown block preset: {preset}")
+        types += BLOCK_PRESETS[preset]["types"]
+        patterns += BLOCK_PRESETS[preset]["patterns"]
+    if not types and not patterns:
+        raise ValueError("resource types or url patterns required")
+    return {"types": sorted(set(types)), "patterns": list(dict.fromkeys(patterns))}
+
+
+def merge_rules(rules: list[dict]) -> dict:
+    types = sorted({name for rule in rules for name in rule["types"]})
+    patterns = list(dict.fromkeys(pattern for rule in rules for pattern in rule["patterns"]))
+    return {"types": types, "patterns": patterns}
+
+
+def fetch_patterns(rules: dict) -> list[dict]:
+    patterns = [{"urlPattern": "*", "resourceType": name, "requestStage": "Request"} for name in rules["types"]]
+    patterns += [{"urlPattern": pattern, "requestStage": "Request"} for pattern in rules["patterns"]]
+    return patterns
+
+
+def is_blocked(rules: dict, kind: str | None, url: str) -> bool:
+    if kind in rules["types"]:
+        return True
+    return any(fnmatchcase(url, pattern) for pattern in rules["patterns"])
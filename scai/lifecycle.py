@@ -0,0 +1,48 @@
+SUSPENDED_STATES = ("frozen", "discarded")
+ACTIVITY_GRACE = 2.0
+
+
+def plan_suspensions(
+    tabs: list[dict],
+    now: float,
+    freeze_idle: float = 0,
+    discard_idle: float = 0,
+    max_live: int = 0,
+    heap_ceiling: int = 0,
+) -> dict[str, str]:
+    plan: dict[str, str] = {}
+    candidates = sorted(
+        (tab for tab in tabs if not tab.get("protected") and now - tab["activity"] >= ACTIVITY_GRACE),
+        key=lambda tab: tab["activity"],
+    )
+
+    def state_of(tab: dict) -> str | None:
+        return plan.get(tab["id"], tab.get("state"))
+
+    for tab in candidates:
+        idle = now - tab["activity"]
+        if discard_idle and idle >= discard_idle and tab.get("state") != "discarded" and tab.get("discardable", True):
+            plan[tab["id"]] = "discarded"
+        elif freeze_idle and idle >= freeze_idle and tab.get("state") is None:
+            plan[tab["id"]] = "frozen"
+    if max_live:
+        excess = sum(1 for tab in tabs if state_of(tab) is None) - max_live
+        for tab in candidates:
+            if excess <= 0:
+                break
+            if state_of(tab) is None:
+                plan[tab["id"]] = "frozen"
+                excess -= 1
+    if heap_ceiling:
+        usage: dict[object, int] = {}
+        for tab in tabs:
+            if state_of(tab) != "discarded":
+                usage[tab["worker"]] = usage.get(tab["worker"], 0) + tab.get("heap", 0)
+        for tab in candidates:
+            worker = tab["worker"]
+            if state_of(tab) == "discarded" or usage.get(worker, 0) <= heap_ceiling:
+                continue
+            if tab.get("heap") and tab.get("discardable", True):
+                plan[tab["id"]] = "discarded"
+                usage[worker] -= tab["heap"]
+    return plan
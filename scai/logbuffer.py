@@ -0,0 +1,66 @@
+import re
+import threading
+from collections import deque
+
+LEVELS = {"debug": 0, "info": 1, "warning": 2, "error": 3}
+
+
+def normalize_level(value: str | None) -> str:
+    level = (value or "info").lower()
+    if level in ("verbose", "debug", "trace"):
+        return "debug"
+    if level in ("warn", "warning"):
+        return "warning"
+    if level in ("error", "severe", "assert"):
+        return "error"
+    return "info"
+
+
+class LogBuffer:
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self.entries: deque = deque(maxlen=self.capacity)
+        self.sequence = 0
+        self.condition = threading.Condition()
+
+    def append(self, tab: str, entry: dict) -> None:
+        with self.condition:
+            self.sequence += 1
+            self.entries.append({"seq": self.sequence, "tab": tab, **entry})
+            self.condition.notify_all()
+
+    def read(
+        self,
+        cursor: int = 0,
+        level: str | None = None,
+        tab: str | None = None,
+        pattern: str | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[dict], int]:
+        with self.condition:
+            entries = [entry for entry in self.entries if entry["seq"] > cursor and (not tab or entry["tab"] == tab)]
+            last = self.sequence
+        if level:
+            minimum = LEVELS[normalize_level(level)]
+            entries = [entry for entry in entries if LEVELS[entry["level"]] >= minimum]
+        if pattern:
+            matcher = re.compile(pattern)
+            entries = [entry for entry in entries if matcher.search(entry.get("message") or "")]
+        if limit is not None and len(entries) > limit:
+            entries = entries[:limit]
+            last = entries[-1]["seq"]
+        return entries, last
+
+    def wait(self, cursor: int, timeout: float) -> bool:
+        with self.condition:
+            return self.condition.wait_for(lambda: self.sequence > cursor, timeout)
+
+    def drop(self, tab: str) -> None:
+        with self.condition:
+            kept = [entry for entry in self.entries if entry["tab"] != tab]
+            if len(kept) != len(self.entries):
+                self.entries = deque(kept, maxlen=self.capacity)
+
+    def clear(self) -> None:
+        with self.condition:
+            self.entries.clear()
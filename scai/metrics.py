@@ -0,0 +1,119 @@
+import threading
+import time
+from bisect import bisect_left
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+        if value > self.maximum:
+            self.maximum = value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(BUCKETS[index], self.maximum) if index < len(BUCKETS) else self.maximum
+        return self.maximum
+
+    def snapshot(self) -> dict:
+        summary = {"count": self.count, "sum": round(self.total, 6), "max": round(self.maximum, 6)}
+        for q in QUANTILES:
+            summary[f"p{int(q * 100)}"] = round(self.quantile(q), 6)
+        return summary
+
+    def prometheus(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+def label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.commands: dict[str, dict] = {}
+        self.phases: dict[str, Histogram] = {}
+
+    def record(self, command: str, wait: float, execution: float, ok: bool) -> None:
+        with self.lock:
+            entry = self.commands.get(command)
+            if entry is None:
+                entry = {"ok": 0, "error": 0, "wait": Histogram(), "exec": Histogram()}
+                self.commands[command] = entry
+            entry["ok" if ok else "error"] += 1
+            entry["wait"].observe(wait)
+            entry["exec"].observe(execution)
+
+    def observe(self, phase: str, value: float) -> None:
+        with self.lock:
+            histogram = self.phases.get(phase)
+            if histogram is None:
+                histogram = Histogram()
+                self.phases[phase] = histogram
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.commands.clear()
+            self.phases.clear()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            commands = {
+                command: {
+                    "ok": entry["ok"],
+                    "error": entry["error"],
+                    "wait": entry["wait"].snapshot(),
+                    "exec": entry["exec"].snapshot(),
+                }
+                for command, entry in sorted(self.commands.items())
+            }
+            phases = {phase: histogram.snapshot() for phase, histogram in sorted(self.phases.items())}
+        return {"uptime_s": round(time.time() - self.started, 3), "commands": commands, "phases": phases}
+
+    def prometheus(self) -> str:
+        lines = [
+            "# TYPE scai_uptime_seconds gauge",
+            f"scai_uptime_seconds {time.time() - self.started:.3f}",
+            "# TYPE scai_commands_total counter",
+        ]
+        with self.lock:
+            commands = sorted(self.commands.items())
+            for command, entry in commands:
+                for status in ("ok", "error"):
+                    lines.append(f'scai_commands_total{{command="{label_value(command)}",status="{status}"}} {entry[status]}')
+            for kind in ("wait", "exec"):
+                lines.append(f"# TYPE scai_command_{kind}_seconds histogram")
+                for command, entry in commands:
+                    lines.extend(entry[kind].prometheus(f"scai_command_{kind}_seconds", f'command="{label_value(command)}"'))
+            if self.phases:
+                lines.append("# TYPE scai_phase_seconds histogram")
+                for phase, histogram in sorted(self.phases.items()):
+                    lines.extend(histogram.prometheus("scai_phase_seconds", f'phase="{label_value(phase)}"'))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,124 @@
+import threading
+import time
+
+WAIT_STRATEGIES = ("load", "domcontentloaded", "networkidle", "none", "selector", "predicate")
+LIFECYCLE_MARKERS = {
+    "load": "load",
+    "domcontentloaded": "DOMContentLoaded",
+    "networkidle": "load",
+    "selector": "init",
+    "predicate": "init",
+}
+NETWORK_IDLE_MS = 500
+WAIT_SCRIPT = """(function(check, timeout) {
+  return new Promise((resolve) => {
+    let observer = null;
+    let interval = null;
+    let timer = null;
+    const finish = (value) => {
+      if (observer) observer.disconnect();
+      clearInterval(interval);
+      clearTimeout(timer);
+      resolve(value);
+    };
+    const test = () => {
+      try {
+        if (check()) {
+          finish(true);
+          return true;
+        }
+      } catch (error) {}
+      return false;
+    };
+    if (test()) return;
+    observer = new MutationObserver(test);
+    observer.observe(document, {childList: true, subtree: true, attributes: true});
+    interval = setInterval(test, 100);
+    timer = setTimeout(() => finish(false), timeout);
+  });
+})(() => (%s), %d)"""
+
+
+def wait_strategy(payload: dict) -> str:
+    strategy = payload.get("wait")
+    if not strategy:
+        if payload.get("selector"):
+            return "selector"
+        if payload.get("predicate"):
+            return "predicate"
+        return "load"
+    strategy = strategy.lower()
+    if strategy not in WAIT_STRATEGIES:
+        raise ValueError("unknown wait strategy")
+    if strategy in ("selector", "predicate") and not payload.get(strategy):
+        raise ValueError(f"{strategy} required")
+    return strategy
+
+
+class PageState:
+    def __init__(self) -> None:
+        self.condition = threading.Condition()
+        self.loader_id: str | None = None
+        self.epoch = 0
+        self.events: set[str] = set()
+        self.inflight: set[str] = set()
+        self.last_activity = time.monotonic()
+        self.network = False
+
+    def mark(self) -> int:
+        with self.condition:
+            return self.epoch
+
+    def on_lifecycle(self, loader_id: str | None, name: str) -> None:
+        with self.condition:
+            if name == "init":
+                self.loader_id = loader_id
+                self.epoch += 1
+                self.events = set()
+                self.inflight.clear()
+                self.last_activity = time.monotonic()
+            elif loader_id != self.loader_id:
+                return
+            self.events.add(name)
+            self.condition.notify_all()
+
+    def on_settled(self) -> None:
+        with self.condition:
+            self.epoch += 1
+            self.events = {"init", "DOMContentLoaded", "load"}
+            self.condition.notify_all()
+
+    def on_request(self, request_id: str, active: bool) -> None:
+        with self.condition:
+            if active:
+                self.inflight.add(request_id)
+            else:
+                self.inflight.discard(request_id)
+            self.last_activity = time.monotonic()
+            self.condition.notify_all()
+
+    def wait_lifecycle(self, name: str, loader_id: str | None, epoch: int, deadline: float) -> bool:
+        def reached() -> bool:
+            if loader_id:
+                current = self.loader_id == loader_id
+            else:
+                current = self.epoch > epoch
+            return current and name in self.events
+
+        with self.condition:
+            return self.condition.wait_for(reached, max(0.0, deadline - time.monotonic()))
+
+    def wait_idle(self, idle_ms: int, deadline: float) -> bool:
+        quiet_period = idle_ms / 1000
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    return False
+                if self.inflight:
+                    self.condition.wait(deadline - now)
+                    continue
+                quiet = now - self.last_activity
+                if quiet >= quiet_period:
+                    return True
+                self.condition.wait(min(quiet_period - quiet, deadline - now))
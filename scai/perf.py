@@ -0,0 +1,133 @@
+import math
+
+VITALS_SCRIPT = """(function() {
+  if (window.__scaiVitals || typeof PerformanceObserver === "undefined") return;
+  const vitals = {fcp: null, lcp: null, cls: 0, inp: null, interactions: 0};
+  let session = 0;
+  let sessionStart = 0;
+  let lastShift = 0;
+  const handlers = {
+    "paint": (entry) => {
+      if (entry.name === "first-contentful-paint") vitals.fcp = entry.startTime;
+    },
+    "largest-contentful-paint": (entry) => {
+      vitals.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+    },
+    "layout-shift": (entry) => {
+      if (entry.hadRecentInput) return;
+      if (session && entry.startTime - lastShift < 1000 && entry.startTime - sessionStart < 5000) {
+        session += entry.value;
+      } else {
+        session = entry.value;
+        sessionStart = entry.startTime;
+      }
+      lastShift = entry.startTime;
+      vitals.cls = Math.max(vitals.cls, session);
+    },
+    "event": (entry) => {
+      if (!entry.interactionId) return;
+      vitals.interactions += 1;
+      vitals.inp = Math.max(vitals.inp || 0, entry.duration);
+    },
+  };
+  const observers = [];
+  for (const type of Object.keys(handlers)) {
+    try {
+      const observer = new PerformanceObserver((list) => list.getEntries().forEach(handlers[type]));
+      observer.observe({type: type, buffered: true, durationThreshold: 16});
+      observers.push([observer, handlers[type]]);
+    } catch (error) {}
+  }
+  Object.defineProperty(window, "__scaiVitals", {
+    value: {
+      read() {
+        for (const [observer, handler] of observers) observer.takeRecords().forEach(handler);
+        return Object.assign({}, vitals);
+      },
+    },
+  });
+})();"""
+
+READ_SCRIPT = """(function() {
+  const round = (value) => value == null ? null : Math.round(value * 1000) / 1000;
+  const navigation = performance.getEntriesByType("navigation")[0];
+  let timing = null;
+  if (navigation) {
+    timing = {
+      type: navigation.type,
+      redirect: round(navigation.redirectEnd - navigation.redirectStart),
+      dns: round(navigation.domainLookupEnd - navigation.domainLookupStart),
+      connect: round(navigation.connectEnd - navigation.connectStart),
+      ttfb: round(navigation.responseStart),
+      response: round(navigation.responseEnd - navigation.responseStart),
+      dom_interactive: round(navigation.domInteractive),
+      dom_content_loaded: round(navigation.domContentLoadedEventEnd),
+      load: round(navigation.loadEventEnd),
+      transfer_size: navigation.transferSize,
+    };
+  }
+  const resources = performance.getEntriesByType("resource");
+  const byType = {};
+  let transfer = 0;
+  for (const entry of resources) {
+    const bucket = byType[entry.initiatorType] || (byType[entry.initiatorType] = {count: 0, transfer_size: 0, duration: 0});
+    bucket.count += 1;
+    bucket.transfer_size += entry.transferSize || 0;
+    bucket.duration = round(bucket.duration + entry.duration);
+    transfer += entry.transferSize || 0;
+  }
+  const slowest = resources.slice().sort((a, b) => b.duration - a.duration).slice(0, 5)
+    .map((entry) => ({name: entry.name, type: entry.initiatorType, duration: round(entry.duration)}));
+  const vitals = window.__scaiVitals ? window.__scaiVitals.read() : null;
+  if (vitals) {
+    for (const key of ["fcp", "lcp", "cls", "inp"]) vitals[key] = round(vitals[key]);
+  }
+  return {
+    url: location.href,
+    navigation: timing,
+    resources: {count: resources.length, transfer_size: transfer, by_type: byType, slowest: slowest},
+    vitals: vitals,
+  };
+})()"""
+PERF_SCRIPT = VITALS_SCRIPT + "\n" + READ_SCRIPT
+
+SUMMARY_FIELDS = {
+    "ttfb": ("navigation", "ttfb"),
+    "dom_content_loaded": ("navigation", "dom_content_loaded"),
+    "load": ("navigation", "load"),
+    "fcp": ("vitals", "fcp"),
+    "lcp": ("vitals", "lcp"),
+    "cls": ("vitals", "cls"),
+    "inp": ("vitals", "inp"),
+    "resources": ("resources", "count"),
+    "transfer_size": ("resources", "transfer_size"),
+    "js_heap_used": ("metrics", "JSHeapUsedSize"),
+    "script_duration": ("metrics", "ScriptDuration"),
+    "layout_count": ("metrics", "LayoutCount"),
+}
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: list[dict]) -> dict:
+    summary = {}
+    for field, (section, key) in SUMMARY_FIELDS.items():
+        values = [
+            sample[section][key]
+            for sample in samples
+            if isinstance(sample.get(section), dict) and isinstance(sample[section].get(key), (int, float))
+        ]
+        if not values:
+            continue
+        summary[field] = {
+            "count": len(values),
+            "p50": percentile(values, 0.5),
+            "p90": percentile(values, 0.9),
+            "p95": percentile(values, 0.95),
+            "max": max(values),
+        }
+    return summary
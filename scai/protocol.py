@@ -0,0 +1,262 @@
+import json
+import os
+import select
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import suppress
+
+READY_FD_ENV = "SCAI_READY_FD"
+READ_TIMEOUT = 120.0
+READ_MARGIN = 10.0
+
+
+def read_timeout(payload: dict) -> float:
+    steps = payload.get("steps")
+    if isinstance(steps, list):
+        return sum(read_timeout(step) for step in steps if isinstance(step, dict)) or READ_TIMEOUT
+    timeout = payload.get("timeout")
+    if isinstance(timeout, (int, float)) and timeout > 0:
+        return timeout + READ_MARGIN
+    return READ_TIMEOUT
+
+
+def encode_message(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class MessageReader:
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.buffer = bytearray()
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.sock.recv(65536)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer.extend(chunk)
+        return True
+
+    def read_line(self) -> bytes | None:
+        while True:
+            index = self.buffer.find(b"\n")
+            if index >= 0:
+                line = bytes(self.buffer[:index])
+                del self.buffer[: index + 1]
+                return line
+            if not self.fill():
+                return None
+
+    def read_to_end(self) -> bytes:
+        while self.fill():
+            pass
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+    def read_message(self) -> dict | None:
+        while True:
+            line = self.read_line()
+            if line is None:
+                return None
+            if line.strip():
+                return json.loads(line.decode("utf-8"))
+
+
+class ClientConnection:
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.reader = MessageReader(sock)
+        self.write_lock = threading.Lock()
+        self.closed = threading.Event()
+        self.eof = threading.Event()
+
+    def read_first(self) -> tuple[dict, bool]:
+        line = self.reader.read_line()
+        if line is not None:
+            try:
+                return json.loads(line.decode("utf-8")), True
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                data = line + b"\n" + self.reader.read_to_end()
+        else:
+            data = self.reader.read_to_end()
+        if not data.strip():
+            return {}, False
+        try:
+            return json.loads(data.decode("utf-8")), False
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return {}, False
+
+    def send(self, message: dict) -> bool:
+        data = encode_message(message)
+        with self.write_lock:
+            if self.closed.is_set():
+                return False
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                self.closed.set()
+                return False
+        return True
+
+    def send_raw(self, message: dict) -> None:
+        with self.write_lock, suppress(OSError):
+            self.sock.sendall(json.dumps(message).encode("utf-8"))
+
+
+class StreamWriter:
+    def __init__(self, client: ClientConnection, request_id: object) -> None:
+        self.client = client
+        self.request_id = request_id
+
+    @property
+    def open(self) -> bool:
+        return not self.client.eof.is_set() and not self.client.closed.is_set()
+
+    def __call__(self, result: dict) -> bool:
+        return self.client.send({"id": self.request_id, "status": "ok", "stream": True, "result": result})
+
+
+class ServiceClient:
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.reader = MessageReader(sock)
+        self.sequence = 0
+        self.pending: dict[int, list[dict]] = {}
+
+    def send(self, payload: dict) -> int:
+        self.sequence += 1
+        request_id = self.sequence
+        self.sock.sendall(encode_message({**payload, "id": request_id}))
+        return request_id
+
+    def receive(self) -> dict:
+        message = self.reader.read_message()
+        if message is None:
+            raise ConnectionError("connection closed")
+        return message
+
+    def receive_for(self, request_id: int) -> dict:
+        queued = self.pending.get(request_id)
+        if queued:
+            message = queued.pop(0)
+            if not queued:
+                del self.pending[request_id]
+            return message
+        while True:
+            message = self.receive()
+            if message.get("id") == request_id:
+                return message
+            self.pending.setdefault(message.get("id"), []).append(message)
+
+    def receive_any(self) -> dict:
+        for request_id, queued in list(self.pending.items()):
+            message = queued.pop(0)
+            if not queued:
+                del self.pending[request_id]
+            return message
+        return self.receive()
+
+    def request(self, payload: dict, timeout: float | None = None) -> dict:
+        self.sock.settimeout(timeout)
+        return self.receive_for(self.send(payload))
+
+    def stream(self, payload: dict, timeout: float | None = None) -> Iterator[dict]:
+        self.sock.settimeout(timeout)
+        request_id = self.send(payload)
+        while True:
+            message = self.receive_for(request_id)
+            yield message
+            if not message.get("stream"):
+                return
+
+    def close(self) -> None:
+        with suppress(OSError):
+            self.sock.close()
+
+
+def open_socket(address: str | tuple[str, int], timeout: float = 10.0) -> socket.socket:
+    if isinstance(address, tuple):
+        return socket.create_connection(address, timeout=timeout)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def listen_socket(address: str | tuple[str, int]) -> socket.socket:
+    if isinstance(address, tuple):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(address)
+    else:
+        try:
+            probe = open_socket(address, timeout=1.0)
+        except OSError:
+            pass
+        else:
+            probe.close()
+            raise OSError(f"service already listening on {address}")
+        with suppress(FileNotFoundError):
+            os.unlink(address)
+        os.makedirs(os.path.dirname(address), exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(address)
+        os.chmod(address, 0o600)
+    server.listen()
+    return server
+
+
+def connect(address: str | tuple[str, int], timeout: float = 10.0) -> ServiceClient:
+    sock = open_socket(address, timeout)
+    sock.settimeout(None)
+    return ServiceClient(sock)
+
+
+def send_oneshot(address: str | tuple[str, int], payload: dict, timeout: float = 10.0) -> dict:
+    with open_socket(address, timeout) as client:
+        client.sendall(json.dumps(payload).encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+        data = bytearray()
+        while True:
+            chunk = client.recv(4096)
+            if not chunk:
+                break
+            data.extend(chunk)
+    if not data:
+        raise RuntimeError("empty response")
+    return json.loads(data.decode("utf-8"))
+
+
+def notify_ready(message: dict) -> None:
+    fd = os.environ.pop(READY_FD_ENV, None)
+    if not fd:
+        return
+    with suppress(OSError, ValueError), os.fdopen(int(fd), "wb") as pipe:
+        pipe.write(encode_message(message))
+
+
+def read_ready(fd: int, timeout: float) -> dict | None:
+    deadline = time.monotonic() + timeout
+    data = bytearray()
+    while b"\n" not in data:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            return None
+        chunk = os.read(fd, 4096)
+        if not chunk:
+            break
+        data.extend(chunk)
+    line = bytes(data).split(b"\n", 1)[0].strip()
+    if not line:
+        return {}
+    return json.loads(line.decode("utf-8"))
@@ -1,25 +1,111 @@
+import base64
 import json
 import os
 import signal
 import socket
-import subprocess
 import sys
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import suppress
 from pathlib import Path
 from urllib.parse import urlparse
-from uuid import uuid4
-import shutil
 
-from selenium import webdriver
-from selenium.common.exceptions import NoSuchWindowException, WebDriverException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.common.exceptions import WebDriverException
 
-from .config import BASE_DIR, HOST, LOG_PATH, PID_PATH, PORT, RUNTIME_DIR
+from .batch import resolve_references
+from .browser import PAGE_LOAD_TIMEOUT, BrowserWorker
+from .cdp import CDP_TIMEOUT, CdpError, browser_websocket_url
+from .config import (
+    CONSOLE_BUFFER_SIZE,
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_LIMIT,
+    MAX_INFLIGHT,
+    MAX_LIVE_TABS,
+    JS_HEAP_CEILING,
+    PID_PATH,
+    RUNTIME_DIR,
+    SERVICE_ADDRESS,
+    STANDBY_BROWSER,
+    TAB_DISCARD_IDLE,
+    TAB_FREEZE_IDLE,
+    TAB_POLICY_INTERVAL,
+    TAB_POOL_RECYCLE,
+    TAB_POOL_SIZE,
+    WATCHDOG_INTERVAL,
+    WORKER_COUNT,
+)
+from .har import NETWORK_EVENTS, NetworkRecorder, write_har
+from .httpcache import CACHE_MODES, ResponseStore, request_key
+from .interception import block_rules, fetch_patterns, is_blocked, merge_rules
+from .lifecycle import ACTIVITY_GRACE, SUSPENDED_STATES, plan_suspensions
+from .logbuffer import LogBuffer, normalize_level
+from .metrics import Metrics
+from .pageload import LIFECYCLE_MARKERS, NETWORK_IDLE_MS, WAIT_SCRIPT, PageState, wait_strategy
+from .perf import PERF_SCRIPT, READ_SCRIPT, VITALS_SCRIPT, summarize
+from .protocol import ClientConnection, StreamWriter, listen_socket, notify_ready
+from .tracing import PROFILE_INTERVAL_US, save_stream, trace_config
+from .watchdog import HEALTH_TIMEOUT, needs_failover, plan_restore, tab_number
 
-CERTIFICATE_DIR = BASE_DIR / "certs"
+TAB_COMMANDS = {
+    "tabs-focus",
+    "tabs-close",
+    "nav-go",
+    "nav-reload",
+    "nav-back",
+    "nav-forward",
+    "page-title",
+    "page-url",
+    "page-perf",
+    "storage-clear",
+    "script-run",
+    "screenshot",
+    "network-record-start",
+    "network-record-stop",
+    "trace-start",
+    "trace-stop",
+    "profile-start",
+    "profile-stop",
+}
+SERVICE_COMMANDS = TAB_COMMANDS | {
+    "ping",
+    "batch",
+    "service-stop",
+    "service-status",
+    "service-metrics",
+    "tabs-open",
+    "tabs-list",
+    "tabs-memory",
+    "page-perf-all",
+    "console-read",
+    "console-follow",
+    "console-clear",
+    "cache-clear",
+    "cache-mode",
+    "cache-stats",
+    "cache-purge",
+    "network-set",
+    "network-reset",
+    "network-block",
+    "network-unblock",
+    "screenshot-all",
+}
+BATCH_EXCLUDED = {"batch", "service-stop"}
+SCREENSHOT_FORMATS = {"png": "png", "jpeg": "jpeg", "jpg": "jpeg", "webp": "webp"}
+SCREENSHOT_OPTIONS = ("quality", "clip", "selector", "scale", "full_page")
+ELEMENT_RECT_SCRIPT = """(function() {
+  const element = document.querySelector(%s);
+  if (!element) return null;
+  const rect = element.getBoundingClientRect();
+  return {x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height};
+})()"""
+
+
+def screenshot_format(value: str | None) -> str:
+    image_format = SCREENSHOT_FORMATS.get((value or "png").lower())
+    if image_format is None:
+        raise ValueError("unknown screenshot format")
+    return image_format
 
 
 class SeleniumService:
@@ -27,14 +113,46 @@ class SeleniumService:
         RUNTIME_DIR.mkdir(parents=True, exist_ok=True)
         with suppress(Exception):
             RUNTIME_DIR.chmod(0o700)
-        self.driver = None
+        self.workers: list[BrowserWorker] = []
         self.active_handle = None
         self.id_sequence = 0
         self.id_to_handle = {}
         self.handle_to_id = {}
+        self.handle_to_worker: dict[str, BrowserWorker] = {}
+        self.tracked_workers: set[BrowserWorker] = set()
+        self.tab_meta: dict[str, dict] = {}
+        self.console = LogBuffer(CONSOLE_BUFFER_SIZE)
+        self.recorders: dict[str, NetworkRecorder] = {}
+        self.page_states: dict[str, PageState] = {}
+        self.traces: dict[str, dict] = {}
+        self.profiles: dict[str, Path] = {}
+        self.block_rules: dict[str, dict] = {}
+        self.blocked_counts: dict[str, int] = {}
+        self.blocked_total = 0
+        self.cache_mode = "off"
+        self.cache_strict = False
+        self.http_store: ResponseStore | None = None
+        self.cache_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="httpcache")
         self.network_profile = "online"
-        self.lock = threading.Lock()
-        self.profile_dir: Path | None = None
+        self.metrics = Metrics()
+        self.lock = threading.RLock()
+        self.tab_queues: dict[str, ThreadPoolExecutor] = {}
+        self.pooled: dict[str, BrowserWorker] = {}
+        self.pool_pending: dict[BrowserWorker, list[dict]] = {}
+        self.pool_filling = False
+        self.pool_stats = {"hits": 0, "misses": 0, "recycled": 0}
+        self.pool_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tabpool")
+        self.tab_states: dict[str, dict] = {}
+        self.tab_activity: dict[str, float] = {}
+        self.tab_heap: dict[str, dict] = {}
+        self.standby: BrowserWorker | None = None
+        self.standby_starting = False
+        self.standby_retry_at = 0.0
+        self.failover_lock = threading.Lock()
+        self.worker_strikes: dict[BrowserWorker, int] = {}
+        self.watchdog_stats: dict[str, object] = {"failovers": 0, "last": None}
+        self.watchdog_wake = threading.Event()
+        self.stop_event = threading.Event()
         signal.signal(signal.SIGTERM, self.handle_signal)
         signal.signal(signal.SIGINT, self.handle_signal)
 
@@ -43,199 +161,508 @@ class SeleniumService:
         sys.exit(0)
 
     def start(self) -> None:
-        self.ensure_driver()
-        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server.bind((HOST, PORT))
-        server.listen()
+        server = None
+        try:
+            server = listen_socket(SERVICE_ADDRESS)
+            self.ensure_driver()
+        except Exception as exc:
+            notify_ready(startup_error(exc))
+            if server is not None:
+                server.close()
+                self.shutdown()
+            raise
+        server.settimeout(0.5)
         PID_PATH.write_text(str(os.getpid()), encoding="utf-8")
+        notify_ready({"status": "ready", "pid": os.getpid(), "workers": len(self.workers)})
+        self.schedule_pool_fill()
+        if TAB_FREEZE_IDLE or TAB_DISCARD_IDLE or MAX_LIVE_TABS or JS_HEAP_CEILING:
+            threading.Thread(target=self.run_tab_policies, name="tabpolicy", daemon=True).start()
+        threading.Thread(target=self.run_watchdog, name="watchdog", daemon=True).start()
+        self.schedule_standby()
         try:
-            running = True
-            while running:
-                conn, _addr = server.accept()
-                with conn:
-                    payload = self.read_request(conn)
-                    if not payload:
-                        continue
-                    response, running = self.handle_request(payload)
-                    conn.sendall(json.dumps(response).encode("utf-8"))
+            while not self.stop_event.is_set():
+                try:
+                    conn, _addr = server.accept()
+                except socket.timeout:
+                    continue
+                thread = threading.Thread(target=self.serve_connection, args=(conn,), daemon=True)
+                thread.start()
         finally:
             server.close()
             self.shutdown()
 
-    def read_request(self, conn: socket.socket) -> dict:
-        data = bytearray()
-        while True:
-            chunk = conn.recv(4096)
-            if not chunk:
-                break
-            data.extend(chunk)
-        if not data:
-            return {}
+    def serve_connection(self, conn: socket.socket) -> None:
+        with conn:
+            client = ClientConnection(conn)
+            payload, framed = client.read_first()
+            if framed:
+                self.serve_framed(client, payload)
+                return
+            if not payload:
+                return
+            response, running = self.handle_request(payload)
+            client.send_raw(response)
+        if not running:
+            self.stop_event.set()
+
+    def serve_framed(self, client: ClientConnection, payload: dict) -> None:
+        slots = threading.BoundedSemaphore(MAX_INFLIGHT)
+        threads = []
+        while payload is not None:
+            slots.acquire()
+            thread = threading.Thread(target=self.serve_slot, args=(slots, client, payload), daemon=True)
+            thread.start()
+            threads.append(thread)
+            threads = [item for item in threads if item.is_alive()]
+            try:
+                payload = client.reader.read_message()
+            except (OSError, ValueError):
+                payload = None
+        client.eof.set()
+        for thread in threads:
+            thread.join()
+        client.closed.set()
+
+    def serve_slot(self, slots: threading.BoundedSemaphore, client: ClientConnection, payload: dict) -> None:
         try:
-            return json.loads(data.decode("utf-8"))
-        except json.JSONDecodeError:
-            return {}
+            self.serve_message(client, payload)
+        finally:
+            slots.release()
+
+    def serve_message(self, client: ClientConnection, payload: dict) -> None:
+        request_id = payload.get("id") if isinstance(payload, dict) else None
+        response, running = self.handle_request(payload, StreamWriter(client, request_id))
+        if isinstance(payload, dict) and "id" in payload:
+            response["id"] = request_id
+        started = time.perf_counter()
+        client.send(response)
+        self.metrics.observe("send", time.perf_counter() - started)
+        if not running:
+            self.stop_event.set()
 
     def ensure_driver(self) -> None:
-        if self.driver is not None:
+        if self.workers:
             return
-        profile_base = BASE_DIR / "profiles"
-        profile_base.mkdir(parents=True, exist_ok=True)
-        with suppress(Exception):
-            profile_base.chmod(0o700)
-        profile_dir = profile_base / f"profile-{os.getpid()}-{uuid4().hex}"
-        if profile_dir.exists():
-            shutil.rmtree(profile_dir, ignore_errors=True)
-        profile_dir.mkdir(parents=True, exist_ok=True)
-        self.profile_dir = profile_dir
-        self.cleanup_profile_locks(profile_dir)
-        self.ensure_certificate_trust(profile_dir)
-        options = Options()
-        options.add_argument(f"--user-data-dir={profile_dir}")
-        options.add_argument("--headless=new")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--disable-software-rasterizer")
-        options.add_argument("--disable-background-networking")
-        options.add_argument("--disable-default-apps")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--remote-allow-origins=*")
-        options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
-        service = ChromeService(log_path=str(LOG_PATH))
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.set_page_load_timeout(60)
-        with suppress(Exception):
-            self.driver.execute_cdp_cmd("Network.enable", {})
-        with suppress(Exception):
-            self.driver.execute_cdp_cmd("Log.enable", {})
+        workers = [BrowserWorker(index) for index in range(WORKER_COUNT)]
+        with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+            futures = [executor.submit(worker.start) for worker in workers]
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            for worker in workers:
+                worker.quit()
+            raise errors[0]
+        self.workers = workers
+        for worker in workers:
+            worker.session_hooks.append(self.on_session_attached)
+            self.watch_targets(worker)
         self.register_existing_tabs()
 
-    def cleanup_profile_locks(self, profile_dir: Path) -> None:
-        for name in ("SingletonLock", "SingletonSocket", "SingletonCookie"):
-            path = profile_dir / name
-            with suppress(Exception):
-                if path.exists():
-                    if path.is_dir():
-                        shutil.rmtree(path)
-                    else:
-                        path.unlink()
+    def register_existing_tabs(self) -> None:
+        self.sync_tabs()
+        if self.active_handle is None and self.workers:
+            self.active_handle = self.workers[0].current_handle()
+
+    def watch_targets(self, worker: BrowserWorker) -> bool:
+        cdp = worker.connect_cdp()
+        if cdp is None:
+            return False
+        cdp.on("Target.targetCreated", lambda params, _session: self.on_target_created(worker, params))
+        cdp.on("Target.targetDestroyed", lambda params, _session: self.on_target_destroyed(worker, params))
+        cdp.on("Target.targetInfoChanged", lambda params, _session: self.on_target_info_changed(worker, params))
+        cdp.on("Runtime.consoleAPICalled", lambda params, session: self.on_console_called(worker, params, session))
+        cdp.on("Runtime.exceptionThrown", lambda params, session: self.on_exception_thrown(worker, params, session))
+        cdp.on("Log.entryAdded", lambda params, session: self.on_log_entry(worker, params, session))
+        cdp.on("Tracing.tracingComplete", lambda params, session: self.on_tracing_complete(worker, params, session))
+        cdp.on("Fetch.requestPaused", lambda params, session: self.on_request_paused(worker, params, session))
+        cdp.on("Page.lifecycleEvent", lambda params, session: self.on_lifecycle_event(worker, params, session))
+        cdp.on("Page.frameNavigated", lambda params, session: self.on_frame_navigated(worker, params, session))
+        cdp.on("Page.navigatedWithinDocument", lambda params, session: self.on_same_document(worker, params, session))
+        for method in NETWORK_EVENTS:
+            cdp.on(method, lambda params, session, method=method: self.on_network_event(worker, method, params, session))
+        cdp.on_close = lambda: self.on_target_events_lost(worker, cdp)
+        try:
+            cdp.call("Target.setDiscoverTargets", {"discover": True})
+        except Exception:
+            cdp.close()
+            worker.cdp = None
+            return False
+        self.sync_tabs(worker, force=True)
+        with self.lock:
+            self.tracked_workers.add(worker)
+        return True
 
-    def ensure_certificate_trust(self, profile_dir: Path) -> None:
-        if not CERTIFICATE_DIR.exists():
+    def on_target_created(self, worker: BrowserWorker, params: dict) -> None:
+        info = params.get("targetInfo") or {}
+        if info.get("type") != "page":
             return
-        with suppress(subprocess.CalledProcessError, FileNotFoundError):
-            self.ensure_nss_db(profile_dir)
-            aliases = self.list_nss_certs(profile_dir)
-            for cert_path in sorted(CERTIFICATE_DIR.glob("*.crt")):
-                alias = cert_path.stem
-                if alias in aliases:
-                    continue
-                self.import_nss_cert(profile_dir, alias, cert_path, "TCu,Cu,Tu")
-                aliases.add(alias)
+        handle = worker.handle_for(info["targetId"])
+        with self.lock:
+            if handle in self.pooled:
+                return
+            pending = self.pool_pending.get(worker)
+            if pending is not None:
+                pending.append(info)
+                return
+        self.register_handle(handle, worker)
+        self.update_tab_meta(handle, info)
+        with suppress(Exception):
+            worker.session(handle)
+
+    def on_session_attached(self, worker: BrowserWorker, handle: str, session_id: str) -> None:
+        worker.cdp.send("Runtime.enable", session_id=session_id)
+        worker.cdp.send("Page.addScriptToEvaluateOnNewDocument", {"source": VITALS_SCRIPT}, session_id=session_id)
+        patterns = self.interception_patterns(self.handle_to_id.get(handle))
+        if patterns:
+            worker.cdp.send("Fetch.enable", {"patterns": patterns}, session_id=session_id)
+        worker.cdp.send("Log.enable", session_id=session_id)
+        worker.cdp.send("Page.enable", session_id=session_id)
+        worker.cdp.send("Page.setLifecycleEventsEnabled", {"enabled": True}, session_id=session_id)
+
+    def on_console_called(self, worker: BrowserWorker, params: dict, session_id: str | None) -> None:
+        parts = []
+        for arg in params.get("args", []):
+            if "value" in arg:
+                value = arg["value"]
+                parts.append(value if isinstance(value, str) else json.dumps(value))
+            else:
+                parts.append(arg.get("description") or arg.get("type", ""))
+        self.record_console(worker, session_id, {
+            "level": normalize_level(params.get("type")),
+            "source": "console",
+            "message": " ".join(parts),
+            "timestamp": params.get("timestamp"),
+        })
+
+    def on_exception_thrown(self, worker: BrowserWorker, params: dict, session_id: str | None) -> None:
+        details = params.get("exceptionDetails") or {}
+        exception = details.get("exception") or {}
+        self.record_console(worker, session_id, {
+            "level": "error",
+            "source": "exception",
+            "message": exception.get("description") or details.get("text") or "",
+            "timestamp": params.get("timestamp"),
+        })
 
-    def ensure_nss_db(self, profile_dir: Path) -> None:
-        db_path = profile_dir / "cert9.db"
-        if db_path.exists():
+    def on_log_entry(self, worker: BrowserWorker, params: dict, session_id: str | None) -> None:
+        entry = params.get("entry") or {}
+        self.record_console(worker, session_id, {
+            "level": normalize_level(entry.get("level")),
+            "source": entry.get("source", "other"),
+            "message": entry.get("text", ""),
+            "timestamp": entry.get("timestamp"),
+        })
+
+    def on_network_event(self, worker: BrowserWorker, method: str, params: dict, session_id: str | None) -> None:
+        if not self.recorders and not self.page_states:
             return
-        subprocess.run(
-            ["certutil", "-d", f"sql:{profile_dir}", "-N", "--empty-password"],
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+        handle = worker.handle_of_session(session_id)
+        tab_id = self.handle_to_id.get(handle) if handle else None
+        if tab_id is None:
+            return
+        state = self.page_states.get(tab_id)
+        if state is not None and method != "Network.dataReceived" and method != "Network.responseReceived":
+            state.on_request(params.get("requestId"), method == "Network.requestWillBeSent")
+        recorder = self.recorders.get(tab_id)
+        if recorder is not None:
+            recorder.record(method, params)
 
-    def list_nss_certs(self, profile_dir: Path) -> set[str]:
-        result = subprocess.run(
-            ["certutil", "-d", f"sql:{profile_dir}", "-L"],
-            check=False,
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            return set()
-        aliases = set()
-        for line in result.stdout.splitlines():
-            line = line.strip()
-            if not line or line.startswith("Certificate Nickname"):
-                continue
-            parts = line.split()
-            if parts:
-                aliases.add(parts[0])
-        return aliases
-
-    def import_nss_cert(self, profile_dir: Path, alias: str, cert_path: Path, trust: str) -> None:
-        subprocess.run(
-            [
-                "certutil",
-                "-d",
-                f"sql:{profile_dir}",
-                "-A",
-                "-t",
-                trust,
-                "-n",
-                alias,
-                "-i",
-                str(cert_path),
-            ],
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+    def on_tracing_complete(self, worker: BrowserWorker, params: dict, session_id: str | None) -> None:
+        handle = worker.handle_of_session(session_id)
+        trace = self.traces.get(self.handle_to_id.get(handle)) if handle else None
+        if trace is not None and not trace["complete"].done():
+            trace["complete"].set_result(params.get("stream"))
 
-    def register_existing_tabs(self) -> None:
-        self.sync_tabs()
-        if self.active_handle is None and self.driver is not None:
-            try:
-                self.active_handle = self.driver.current_window_handle
-            except WebDriverException:
-                handles = self.driver.window_handles
-                self.active_handle = handles[0] if handles else None
+    def on_request_paused(self, worker: BrowserWorker, params: dict, session_id: str | None) -> None:
+        handle = worker.handle_of_session(session_id)
+        tab_id = self.handle_to_id.get(handle) if handle else None
+        request_id = params.get("requestId")
+        request = params.get("request") or {}
+        url = request.get("url", "")
+        if "responseStatusCode" in params or "responseErrorReason" in params:
+            if self.cache_mode == "record" and self.http_store is not None:
+                self.cache_writer.submit(self.record_response, worker, params, session_id)
+            else:
+                worker.cdp.send("Fetch.continueRequest", {"requestId": request_id}, session_id)
+            return
+        if is_blocked(self.tab_rules(tab_id), params.get("resourceType"), url):
+            with self.lock:
+                self.blocked_total += 1
+                if tab_id is not None:
+                    self.blocked_counts[tab_id] = self.blocked_counts.get(tab_id, 0) + 1
+            worker.cdp.send("Fetch.failRequest", {"requestId": request_id, "errorReason": "BlockedByClient"}, session_id)
+            return
+        store = self.http_store
+        if self.cache_mode == "replay" and store is not None:
+            cached = store.get(request_key(request.get("method", "GET"), url, request.get("postData")))
+            if cached is not None:
+                entry, content = cached
+                worker.cdp.send(
+                    "Fetch.fulfillRequest",
+                    {
+                        "requestId": request_id,
+                        "responseCode": entry["status"],
+                        "responseHeaders": entry["headers"],
+                        "body": base64.b64encode(content).decode("ascii"),
+                    },
+                    session_id,
+                )
+                return
+            if self.cache_strict:
+                worker.cdp.send("Fetch.failRequest", {"requestId": request_id, "errorReason": "InternetDisconnected"}, session_id)
+                return
+        worker.cdp.send("Fetch.continueRequest", {"requestId": request_id}, session_id)
+
+    def record_response(self, worker: BrowserWorker, params: dict, session_id: str | None) -> None:
+        request_id = params.get("requestId")
+        request = params.get("request") or {}
+        status = params.get("responseStatusCode") or 0
+        try:
+            if 200 <= status < 300 and request.get("method", "GET") in ("GET", "POST"):
+                result = worker.cdp.call("Fetch.getResponseBody", {"requestId": request_id}, session_id)
+                content = result.get("body", "")
+                content = base64.b64decode(content) if result.get("base64Encoded") else content.encode("utf-8")
+                key = request_key(request.get("method", "GET"), request.get("url", ""), request.get("postData"))
+                self.http_store.put(key, request.get("url", ""), status, params.get("responseHeaders") or [], content)
+        except Exception:
+            pass
+        finally:
+            worker.cdp.send("Fetch.continueRequest", {"requestId": request_id}, session_id)
+
+    def tab_rules(self, tab_id: str | None) -> dict:
+        with self.lock:
+            rules = [self.block_rules[key] for key in ("*", tab_id) if key in self.block_rules]
+        return merge_rules(rules)
+
+    def interception_patterns(self, tab_id: str | None) -> list[dict]:
+        patterns = fetch_patterns(self.tab_rules(tab_id))
+        if self.cache_mode == "replay":
+            patterns.append({"urlPattern": "*", "requestStage": "Request"})
+        elif self.cache_mode == "record":
+            patterns.append({"urlPattern": "*", "requestStage": "Response"})
+        return patterns
+
+    def apply_interception(self, handle: str) -> None:
+        worker = self.worker_of(handle)
+        if not worker.has_cdp:
+            return
+        patterns = self.interception_patterns(self.handle_to_id.get(handle))
+        if patterns:
+            worker.target_call(handle, "Fetch.enable", {"patterns": patterns})
+        else:
+            worker.target_call(handle, "Fetch.disable")
+
+    def on_lifecycle_event(self, worker: BrowserWorker, params: dict, session_id: str | None) -> None:
+        state = self.session_page_state(worker, session_id, params.get("frameId"))
+        if state is not None:
+            state.on_lifecycle(params.get("loaderId"), params.get("name", ""))
+
+    def on_frame_navigated(self, worker: BrowserWorker, params: dict, session_id: str | None) -> None:
+        frame = params.get("frame") or {}
+        if params.get("type") != "BackForwardCacheRestore":
+            return
+        state = self.session_page_state(worker, session_id, frame.get("id"))
+        if state is not None:
+            state.on_settled()
+
+    def on_same_document(self, worker: BrowserWorker, params: dict, session_id: str | None) -> None:
+        state = self.session_page_state(worker, session_id, params.get("frameId"))
+        if state is not None:
+            state.on_settled()
+
+    def session_page_state(self, worker: BrowserWorker, session_id: str | None, frame_id: str | None) -> PageState | None:
+        handle = worker.handle_of_session(session_id)
+        if handle is None or worker.target_of(handle) != frame_id:
+            return None
+        tab_id = self.handle_to_id.get(handle)
+        return self.page_states.get(tab_id) if tab_id else None
+
+    def page_state(self, tab_id: str) -> PageState:
+        with self.lock:
+            state = self.page_states.get(tab_id)
+            if state is None:
+                state = PageState()
+                self.page_states[tab_id] = state
+            return state
+
+    def record_console(self, worker: BrowserWorker, session_id: str | None, entry: dict) -> None:
+        handle = worker.handle_of_session(session_id)
+        tab_id = self.handle_to_id.get(handle) if handle else None
+        if tab_id is not None:
+            self.console.append(tab_id, entry)
+
+    def on_target_info_changed(self, worker: BrowserWorker, params: dict) -> None:
+        info = params.get("targetInfo") or {}
+        handle = worker.handle_for(info.get("targetId", ""))
+        if self.handle_to_worker.get(handle) is worker:
+            self.update_tab_meta(handle, info)
+
+    def update_tab_meta(self, handle: str, info: dict) -> None:
+        with self.lock:
+            self.tab_meta[handle] = {"url": info.get("url", ""), "title": info.get("title", "")}
+
+    def refresh_tab_meta(self, worker: BrowserWorker) -> None:
+        with suppress(Exception):
+            result = worker.cdp.call("Target.getTargets")
+            for info in result.get("targetInfos", []):
+                if info.get("type") == "page":
+                    self.update_tab_meta(worker.handle_for(info["targetId"]), info)
+
+    def on_target_destroyed(self, worker: BrowserWorker, params: dict) -> None:
+        handle = worker.handle_for(params.get("targetId", ""))
+        with self.lock:
+            if self.pooled.get(handle) is worker:
+                del self.pooled[handle]
+        if self.handle_to_worker.get(handle) is worker:
+            self.unregister_handle(handle)
+
+    def on_target_events_lost(self, worker: BrowserWorker, cdp) -> None:
+        with self.lock:
+            self.tracked_workers.discard(worker)
+        if self.stop_event.is_set() or worker.driver is None or worker.cdp is not cdp or worker not in self.workers:
+            return
+        self.watchdog_wake.set()
+        threading.Timer(1.0, self.watch_targets, args=(worker,)).start()
 
-    def sync_tabs(self) -> None:
-        if self.driver is None:
+    def sync_tabs(self, only: BrowserWorker | None = None, force: bool = False) -> None:
+        if not self.workers:
+            return
+        workers = [only] if only is not None else list(self.workers)
+        if not force:
+            workers = [worker for worker in workers if worker not in self.tracked_workers]
+        if not workers:
             return
         handles = []
-        with suppress(WebDriverException):
-            handles = self.driver.window_handles
-        for handle in handles:
-            if handle not in self.handle_to_id:
-                self.register_handle(handle)
-        stale_handles = [handle for handle in self.handle_to_id if handle not in handles]
-        for handle in stale_handles:
-            tab_id = self.handle_to_id.pop(handle)
+        for worker in workers:
+            for handle in worker.window_handles():
+                handles.append(handle)
+                if handle not in self.handle_to_id and handle not in self.pooled:
+                    self.register_handle(handle, worker)
+        with self.lock:
+            stale_handles = [
+                handle
+                for handle, worker in self.handle_to_worker.items()
+                if worker in workers and handle not in handles
+            ]
+            for handle in stale_handles:
+                self.unregister_handle(handle)
+            if self.active_handle not in self.handle_to_id:
+                self.active_handle = next(iter(self.handle_to_id), None)
+
+    def register_handle(self, handle: str, worker: BrowserWorker) -> str:
+        with self.lock:
+            if handle in self.handle_to_id:
+                return self.handle_to_id[handle]
+            self.id_sequence += 1
+            tab_id = f"tab-{self.id_sequence}"
+            self.handle_to_id[handle] = tab_id
+            self.id_to_handle[tab_id] = handle
+            self.handle_to_worker[handle] = worker
+            self.tab_activity[tab_id] = time.monotonic()
+            return tab_id
+
+    def unregister_handle(self, handle: str) -> None:
+        with self.lock:
+            tab_id = self.handle_to_id.pop(handle, None)
             self.id_to_handle.pop(tab_id, None)
+            worker = self.handle_to_worker.pop(handle, None)
+            if worker is not None:
+                worker.forget_handle(handle)
+            self.tab_meta.pop(handle, None)
+            self.release_tab_queue(tab_id)
+            if tab_id is not None:
+                self.console.drop(tab_id)
+                self.page_states.pop(tab_id, None)
+                self.tab_states.pop(tab_id, None)
+                self.tab_activity.pop(tab_id, None)
+                self.tab_heap.pop(tab_id, None)
+                self.traces.pop(tab_id, None)
+                self.profiles.pop(tab_id, None)
+                self.block_rules.pop(tab_id, None)
+                self.blocked_counts.pop(tab_id, None)
+                recorder = self.recorders.pop(tab_id, None)
+                if recorder is not None:
+                    recorder.close()
             if self.active_handle == handle:
                 self.active_handle = None
-        if self.active_handle not in handles:
-            self.active_handle = handles[0] if handles else None
-
-    def register_handle(self, handle: str) -> str:
-        if handle in self.handle_to_id:
-            return self.handle_to_id[handle]
-        self.id_sequence += 1
-        tab_id = f"tab-{self.id_sequence}"
-        self.handle_to_id[handle] = tab_id
-        self.id_to_handle[tab_id] = handle
-        return tab_id
-
-    def handle_request(self, payload: dict) -> tuple[dict, bool]:
-        command = payload.get("command")
+
+    def worker_of(self, handle: str) -> BrowserWorker:
+        worker = self.handle_to_worker.get(handle)
+        if worker is None:
+            raise RuntimeError("tab unavailable")
+        return worker
+
+    def worker_load(self, worker: BrowserWorker) -> int:
+        return sum(1 for item in self.handle_to_worker.values() if item is worker)
+
+    def tab_queue(self, tab_id: str) -> ThreadPoolExecutor:
+        with self.lock:
+            queue = self.tab_queues.get(tab_id)
+            if queue is None:
+                queue = ThreadPoolExecutor(max_workers=1, thread_name_prefix=tab_id)
+                self.tab_queues[tab_id] = queue
+            return queue
+
+    def release_tab_queue(self, tab_id: str | None) -> None:
+        with self.lock:
+            queue = self.tab_queues.pop(tab_id, None)
+        if queue is not None:
+            queue.shutdown(wait=False)
+
+    def handle_request(self, payload: dict, emit: StreamWriter | None = None) -> tuple[dict, bool]:
+        command = None
+        started = time.perf_counter()
+        timing = {"wait": 0.0}
         try:
-            with self.lock:
-                result, running = self.dispatch(command, payload)
+            if not isinstance(payload, dict):
+                raise ValueError("request must be a JSON object")
+            command = payload.get("command")
+            if isinstance(command, str) and command in TAB_COMMANDS:
+                result, running = self.dispatch_tab(command, payload, timing)
+            else:
+                result, running = self.dispatch(command, payload, emit)
+            response = {"status": "ok", "result": result}
         except Exception as exc:
-            return {"status": "error", "message": str(exc)}, True
-        return {"status": "ok", "result": result}, running
+            response, running = {"status": "error", "message": str(exc)}, True
+            if isinstance(exc, WebDriverException):
+                self.watchdog_wake.set()
+        elapsed = time.perf_counter() - started
+        name = command if isinstance(command, str) and command in SERVICE_COMMANDS else "unknown"
+        self.metrics.record(name, timing["wait"], elapsed - timing["wait"], response["status"] == "ok")
+        if isinstance(payload, dict) and payload.get("timing"):
+            response["timing"] = {
+                "wait_ms": round(timing["wait"] * 1000, 3),
+                "exec_ms": round((elapsed - timing["wait"]) * 1000, 3),
+            }
+        return response, running
+
+    def dispatch_tab(self, command: str, payload: dict, timing: dict) -> tuple[dict, bool]:
+        handle = self.resolve_handle(payload.get("tab"))
+        queued = time.perf_counter()
+        with self.lock:
+            tab_id = self.handle_to_id.get(handle)
+            if tab_id is None:
+                raise RuntimeError("tab unavailable")
+            future = self.tab_queue(tab_id).submit(self.run_queued, queued, timing, command, {**payload, "tab": tab_id})
+        return future.result()
+
+    def run_queued(self, queued: float, timing: dict, command: str, payload: dict) -> tuple[dict, bool]:
+        timing["wait"] = time.perf_counter() - queued
+        try:
+            return self.dispatch(command, payload)
+        finally:
+            self.touch_tab(payload["tab"])
 
-    def dispatch(self, command: str, payload: dict) -> tuple[dict, bool]:
+    def dispatch(self, command: str, payload: dict, emit: StreamWriter | None = None) -> tuple[dict, bool]:
         if command == "ping":
             return {"pid": os.getpid()}, True
+        if command == "batch":
+            return self.run_batch(payload, emit), True
         if command == "service-stop":
             return self.stop_service()
         if command == "service-status":
             return self.service_status(), True
+        if command == "service-metrics":
+            return self.service_metrics(payload), True
         if command == "tabs-open":
             return self.tabs_open(), True
         if command == "tabs-list":
@@ -244,6 +671,8 @@ class SeleniumService:
             return self.tabs_focus(payload), True
         if command == "tabs-close":
             return self.tabs_close(payload), True
+        if command == "tabs-memory":
+            return self.tabs_memory(), True
         if command == "nav-go":
             return self.nav_go(payload), True
         if command == "nav-reload":
@@ -254,86 +683,693 @@ class SeleniumService:
             return self.nav_forward(payload), True
         if command == "page-title":
             return self.page_title(payload), True
+        if command == "page-perf":
+            return self.page_perf(payload), True
+        if command == "page-perf-all":
+            return self.page_perf_all(payload), True
         if command == "page-url":
             return self.page_url(payload), True
         if command == "console-read":
-            return self.console_read(), True
+            return self.console_read(payload), True
+        if command == "console-follow":
+            return self.console_follow(payload, emit), True
         if command == "console-clear":
             return self.console_clear(), True
         if command == "cache-clear":
             return self.cache_clear(), True
+        if command == "cache-mode":
+            return self.cache_set_mode(payload), True
+        if command == "cache-stats":
+            return self.cache_stats(), True
+        if command == "cache-purge":
+            return self.cache_purge(), True
         if command == "storage-clear":
             return self.storage_clear(payload), True
         if command == "network-set":
             return self.network_set(payload), True
         if command == "network-reset":
             return self.network_reset(), True
+        if command == "network-block":
+            return self.network_block(payload), True
+        if command == "network-unblock":
+            return self.network_unblock(payload), True
+        if command == "network-record-start":
+            return self.network_record_start(payload), True
+        if command == "network-record-stop":
+            return self.network_record_stop(payload), True
+        if command == "trace-start":
+            return self.trace_start(payload), True
+        if command == "trace-stop":
+            return self.trace_stop(payload), True
+        if command == "profile-start":
+            return self.profile_start(payload), True
+        if command == "profile-stop":
+            return self.profile_stop(payload), True
         if command == "script-run":
             return self.script_run(payload), True
+        if command == "screenshot-all":
+            return self.screenshot_all(payload), True
         if command == "screenshot":
             return self.screenshot(payload), True
         raise ValueError("unknown command")
 
+    def run_batch(self, payload: dict, emit: StreamWriter | None) -> dict:
+        steps = payload.get("steps")
+        if not isinstance(steps, list):
+            raise ValueError("steps required")
+        keep_going = bool(payload.get("continue_on_error"))
+        results: dict[str, object] = {}
+        reports = []
+        executed = 0
+        failed = 0
+        started = time.perf_counter()
+        for index, step in enumerate(steps):
+            report = self.run_batch_step(index, step, results)
+            executed += 1
+            if emit is None:
+                reports.append(report)
+            else:
+                emit(report)
+            if report["status"] != "ok":
+                failed += 1
+                if not keep_going:
+                    break
+        summary = {
+            "steps": executed,
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        if emit is None:
+            summary["results"] = reports
+        return summary
+
+    def run_batch_step(self, index: int, step: object, results: dict[str, object]) -> dict:
+        started = time.perf_counter()
+        name = step.get("name") if isinstance(step, dict) else None
+        command = step.get("command") if isinstance(step, dict) else None
+        try:
+            if not isinstance(step, dict):
+                raise ValueError("step must be an object")
+            if command in BATCH_EXCLUDED:
+                raise ValueError(f"{command} is not allowed in a batch")
+            request = resolve_references({key: value for key, value in step.items() if key not in ("name", "id")}, results)
+            response, _running = self.handle_request(request)
+        except Exception as exc:
+            response = {"status": "error", "message": str(exc)}
+        report = {"index": index, "command": command, "status": response["status"]}
+        if name:
+            report["name"] = name
+        if response["status"] == "ok":
+            result = response.get("result")
+            report["result"] = result
+            results[str(index)] = result
+            results["prev"] = result
+            if name:
+                results[name] = result
+        else:
+            report["message"] = response.get("message")
+        report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return report
+
     def stop_service(self) -> tuple[dict, bool]:
         self.shutdown()
         return {"stopped": True}, False
 
     def service_status(self) -> dict:
+        tabs = self.describe_tabs()
+        workers = [{"index": worker.index, "tabs": self.worker_load(worker)} for worker in self.workers]
+        with self.lock:
+            blocking = {
+                "rules": dict(self.block_rules),
+                "blocked": self.blocked_total,
+                "tabs": dict(self.blocked_counts),
+            }
+            lifecycle = {
+                "freeze_idle_s": TAB_FREEZE_IDLE,
+                "discard_idle_s": TAB_DISCARD_IDLE,
+                "max_live_tabs": MAX_LIVE_TABS,
+                "js_heap_ceiling": JS_HEAP_CEILING,
+                **{state: sum(1 for item in self.tab_states.values() if item["state"] == state) for state in SUSPENDED_STATES},
+            }
+            tab_pool = {"size": TAB_POOL_SIZE, "idle": len(self.pooled), "recycle": TAB_POOL_RECYCLE, **self.pool_stats}
+            if self.standby is not None:
+                standby = "ready"
+            elif self.standby_starting:
+                standby = "starting"
+            else:
+                standby = "enabled" if STANDBY_BROWSER else "disabled"
+            watchdog = {"interval_s": WATCHDOG_INTERVAL, "standby": standby, **self.watchdog_stats}
+        return {
+            "pid": os.getpid(),
+            "network": self.network_profile,
+            "workers": workers,
+            "tabs": tabs,
+            "blocking": blocking,
+            "http_cache": self.cache_stats() if self.http_store is not None else {"mode": self.cache_mode},
+            "tab_pool": tab_pool,
+            "lifecycle": lifecycle,
+            "watchdog": watchdog,
+        }
+
+    def service_metrics(self, payload: dict) -> dict:
+        output_format = payload.get("format") or "json"
+        if output_format == "prometheus":
+            result = {"format": output_format, "text": self.metrics.prometheus()}
+        elif output_format == "json":
+            result = {"format": output_format, **self.metrics.snapshot()}
+        else:
+            raise ValueError("unknown metrics format")
+        if payload.get("reset"):
+            self.metrics.reset()
+        return result
+
+    def describe_tabs(self) -> list[dict]:
         self.sync_tabs()
-        tabs = []
-        for handle, tab_id in self.handle_to_id.items():
-            info = {"id": tab_id, "handle": handle, "active": handle == self.active_handle}
-            with suppress(WebDriverException):
-                self.driver.switch_to.window(handle)
-                info["url"] = self.driver.current_url
-                info["title"] = self.driver.title
-            tabs.append(info)
-        return {"pid": os.getpid(), "network": self.network_profile, "tabs": tabs}
+        with self.lock:
+            entries = [(handle, tab_id, self.handle_to_worker.get(handle)) for handle, tab_id in self.handle_to_id.items()]
+        stale = {worker for handle, _tab_id, worker in entries if handle not in self.tab_meta and worker in self.tracked_workers}
+        for worker in stale:
+            self.refresh_tab_meta(worker)
+        switched = set()
+        items = []
+        for handle, tab_id, worker in entries:
+            if worker is None:
+                continue
+            item = {"id": tab_id, "handle": handle, "active": handle == self.active_handle, "worker": worker.index}
+            meta = self.tab_meta.get(handle) if worker in self.tracked_workers else None
+            if meta is None:
+                meta = self.read_tab_meta(worker, handle)
+                switched.add(worker)
+            item.update(meta)
+            state = self.tab_states.get(tab_id)
+            if state is not None:
+                item["state"] = state["state"]
+                if state.get("url"):
+                    item["url"] = state["url"]
+            items.append(item)
+        for worker in switched:
+            if self.handle_to_worker.get(self.active_handle) is worker:
+                with suppress(WebDriverException):
+                    worker.focus(self.active_handle)
+        return items
+
+    def read_tab_meta(self, worker: BrowserWorker, handle: str) -> dict:
+        meta = {}
+        with worker.lock, suppress(WebDriverException):
+            driver = worker.focus(handle)
+            meta["url"] = driver.current_url
+            meta["title"] = driver.title
+        return meta
 
     def tabs_open(self) -> dict:
         self.sync_tabs()
-        if self.driver is None:
+        if not self.workers:
             raise RuntimeError("driver unavailable")
-        self.driver.switch_to.new_window("tab")
-        handle = self.driver.current_window_handle
-        tab_id = self.register_handle(handle)
+        pooled = self.take_pooled_tab()
+        if pooled is not None:
+            handle, worker = pooled
+        else:
+            with self.lock:
+                worker = min(self.workers, key=self.worker_load)
+            with worker.lock:
+                worker.driver.switch_to.new_window("tab")
+                handle = worker.driver.current_window_handle
+                worker.focused_handle = handle
+        tab_id = self.register_handle(handle, worker)
         self.active_handle = handle
-        return {"tab": tab_id, "handle": handle}
+        if pooled is not None:
+            with suppress(Exception):
+                self.apply_interception(handle)
+        with self.lock:
+            self.pool_stats["misses" if pooled is None else "hits"] += 1
+        self.schedule_pool_fill()
+        return {"tab": tab_id, "handle": handle, "worker": worker.index, "pooled": pooled is not None}
+
+    def take_pooled_tab(self) -> tuple[str, BrowserWorker] | None:
+        with self.lock:
+            if not self.pooled:
+                return None
+            handle = min(self.pooled, key=lambda item: self.worker_load(self.pooled[item]))
+            return handle, self.pooled.pop(handle)
+
+    def schedule_pool_fill(self) -> None:
+        with self.lock:
+            if TAB_POOL_SIZE <= 0 or self.pool_filling or len(self.pooled) >= TAB_POOL_SIZE:
+                return
+            self.pool_filling = True
+        try:
+            self.pool_executor.submit(self.fill_pool)
+        except RuntimeError:
+            with self.lock:
+                self.pool_filling = False
+
+    def fill_pool(self) -> None:
+        try:
+            while not self.stop_event.is_set():
+                with self.lock:
+                    if not self.workers or len(self.pooled) >= TAB_POOL_SIZE:
+                        return
+                    idle = {worker: 0 for worker in self.workers}
+                    for worker in self.pooled.values():
+                        idle[worker] = idle.get(worker, 0) + 1
+                    worker = min(self.workers, key=lambda item: (idle[item], self.worker_load(item)))
+                self.create_pooled_tab(worker)
+        except Exception:
+            pass
+        finally:
+            with self.lock:
+                self.pool_filling = False
+
+    def create_pooled_tab(self, worker: BrowserWorker) -> None:
+        handle = None
+        with worker.lock:
+            with self.lock:
+                self.pool_pending[worker] = []
+            try:
+                worker.driver.switch_to.new_window("tab")
+                handle = worker.driver.current_window_handle
+                worker.focused_handle = handle
+                with self.lock:
+                    self.pooled[handle] = worker
+            finally:
+                with self.lock:
+                    pending = self.pool_pending.pop(worker, [])
+        for info in pending:
+            if worker.handle_for(info["targetId"]) != handle:
+                self.on_target_created(worker, {"targetInfo": info})
+        if worker.has_cdp:
+            with suppress(Exception):
+                worker.session(handle)
+
+    def recycle_tab(self, worker: BrowserWorker, handle: str) -> bool:
+        with self.lock:
+            if TAB_POOL_SIZE <= 0 or len(self.pooled) >= TAB_POOL_SIZE or not worker.has_cdp:
+                return False
+        try:
+            origin = worker.evaluate(handle, "location.origin")
+            worker.target_call(handle, "Page.navigate", {"url": "about:blank"})
+            worker.target_call(handle, "Page.resetNavigationHistory")
+            if isinstance(origin, str) and origin.startswith(("http://", "https://")):
+                worker.target_call(handle, "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            session_id = worker.session(handle)
+        except Exception:
+            return False
+        self.unregister_handle(handle)
+        with suppress(Exception):
+            worker.cdp.send("Target.detachFromTarget", {"sessionId": session_id})
+        with self.lock:
+            self.pooled[handle] = worker
+            self.pool_stats["recycled"] += 1
+        return True
+
+    def touch_tab(self, tab_id: str | None) -> None:
+        with self.lock:
+            if tab_id in self.id_to_handle:
+                self.tab_activity[tab_id] = time.monotonic()
+
+    def thaw_tab(self, handle: str) -> None:
+        tab_id = self.handle_to_id.get(handle)
+        if tab_id is None:
+            return
+        with self.lock:
+            self.tab_activity[tab_id] = time.monotonic()
+            state = self.tab_states.get(tab_id)
+            if state is None:
+                return
+            thawing = state.get("thawing")
+            owner = thawing is None
+            if owner:
+                thawing = state["thawing"] = threading.Event()
+        if not owner:
+            thawing.wait(PAGE_LOAD_TIMEOUT)
+            return
+        try:
+            state["ready"].wait(CDP_TIMEOUT)
+            worker = self.worker_of(handle)
+            if state["state"] == "frozen":
+                worker.target_call(handle, "Page.setWebLifecycleState", {"state": "active"})
+            elif state.get("url"):
+                url = state["url"]
+                worker.target_call(handle, "Page.setWebLifecycleState", {"state": "active"})
+                self.navigate(handle, {}, lambda: worker.target_call(handle, "Page.navigate", {"url": url}))
+        finally:
+            with self.lock:
+                if self.tab_states.get(tab_id) is state:
+                    del self.tab_states[tab_id]
+            thawing.set()
+
+    def suspend_tab(self, tab_id: str, target: str) -> bool:
+        with self.lock:
+            handle = self.id_to_handle.get(tab_id)
+            worker = self.handle_to_worker.get(handle) if handle else None
+            if worker is None or not worker.has_cdp or handle == self.active_handle or self.tab_busy(tab_id):
+                return False
+            if time.monotonic() - self.tab_activity.get(tab_id, 0) < ACTIVITY_GRACE:
+                return False
+            current = self.tab_states.get(tab_id)
+            if current is not None and (target != "discarded" or current["state"] != "frozen" or "thawing" in current):
+                return False
+            state = {"state": target, "since": time.time(), "ready": threading.Event()}
+            self.tab_states[tab_id] = state
+        try:
+            if target == "frozen":
+                worker.target_call(handle, "Page.setWebLifecycleState", {"state": "frozen"})
+            else:
+                if current is not None:
+                    worker.target_call(handle, "Page.setWebLifecycleState", {"state": "active"})
+                url = worker.evaluate(handle, "location.href")
+                if not isinstance(url, str) or not url.startswith(("http://", "https://", "file://")):
+                    raise ValueError("nothing to discard")
+                state["url"] = url
+                worker.target_call(handle, "Page.navigate", {"url": "about:blank"})
+                self.tab_heap.pop(tab_id, None)
+            return True
+        except Exception:
+            with self.lock:
+                if self.tab_states.get(tab_id) is state and "thawing" not in state:
+                    if current is None:
+                        del self.tab_states[tab_id]
+                    else:
+                        self.tab_states[tab_id] = current
+            return False
+        finally:
+            state["ready"].set()
+
+    def tab_busy(self, tab_id: str) -> bool:
+        return tab_id in self.recorders or tab_id in self.traces or tab_id in self.profiles
+
+    def measure_heap(self, tab_id: str, handle: str, worker: BrowserWorker) -> dict | None:
+        state = self.tab_states.get(tab_id)
+        if state is not None:
+            return None if state["state"] == "discarded" else self.tab_heap.get(tab_id)
+        if not worker.has_cdp:
+            return None
+        try:
+            usage = worker.target_call(handle, "Runtime.getHeapUsage", timeout=5)
+        except Exception:
+            return self.tab_heap.get(tab_id)
+        heap = {"used": int(usage.get("usedSize", 0)), "total": int(usage.get("totalSize", 0))}
+        with self.lock:
+            if tab_id in self.id_to_handle:
+                self.tab_heap[tab_id] = heap
+        return heap
+
+    def tab_records(self, measure: bool) -> list[dict]:
+        with self.lock:
+            entries = [(tab_id, handle, self.handle_to_worker.get(handle)) for handle, tab_id in self.handle_to_id.items()]
+        records = []
+        for tab_id, handle, worker in entries:
+            if worker is None:
+                continue
+            heap = self.measure_heap(tab_id, handle, worker) if measure else self.tab_heap.get(tab_id)
+            state = self.tab_states.get(tab_id)
+            url = (self.tab_meta.get(handle) or {}).get("url", "")
+            records.append({
+                "id": tab_id,
+                "handle": handle,
+                "worker": worker.index,
+                "activity": self.tab_activity.get(tab_id, 0.0),
+                "state": state["state"] if state is not None else None,
+                "heap": (heap or {}).get("total", 0),
+                "heap_used": (heap or {}).get("used", 0),
+                "discardable": not url.startswith(("about:", "chrome:", "data:")),
+                "protected": handle == self.active_handle or self.tab_busy(tab_id) or (state is not None and "thawing" in state),
+            })
+        return records
+
+    def enforce_tab_policies(self) -> dict[str, str]:
+        records = self.tab_records(measure=bool(JS_HEAP_CEILING))
+        plan = plan_suspensions(
+            records,
+            time.monotonic(),
+            freeze_idle=TAB_FREEZE_IDLE,
+            discard_idle=TAB_DISCARD_IDLE,
+            max_live=MAX_LIVE_TABS,
+            heap_ceiling=JS_HEAP_CEILING,
+        )
+        jobs = []
+        for tab_id, target in plan.items():
+            if tab_id not in self.id_to_handle:
+                continue
+            with suppress(RuntimeError):
+                jobs.append((tab_id, target, self.tab_queue(tab_id).submit(self.suspend_tab, tab_id, target)))
+        applied = {}
+        for tab_id, target, job in jobs:
+            with suppress(Exception):
+                if job.result():
+                    applied[tab_id] = target
+        return applied
+
+    def run_tab_policies(self) -> None:
+        while not self.stop_event.wait(TAB_POLICY_INTERVAL):
+            if not self.workers:
+                continue
+            try:
+                self.enforce_tab_policies()
+            except Exception as exc:
+                print(f"tab policy failed: {exc!r}", file=sys.stderr, flush=True)
+
+    def tabs_memory(self) -> dict:
+        now = time.monotonic()
+        tabs = []
+        workers: dict[int, dict] = {}
+        for record in self.tab_records(measure=True):
+            totals = workers.setdefault(record["worker"], {"worker": record["worker"], "tabs": 0, "heap_used": 0, "heap_total": 0})
+            totals["tabs"] += 1
+            totals["heap_used"] += record["heap_used"]
+            totals["heap_total"] += record["heap"]
+            tabs.append({
+                "id": record["id"],
+                "worker": record["worker"],
+                "state": record["state"] or "live",
+                "idle_s": round(now - record["activity"], 3) if record["activity"] else None,
+                "heap_used": record["heap_used"],
+                "heap_total": record["heap"],
+            })
+        return {"tabs": tabs, "workers": list(workers.values()), "js_heap_ceiling": JS_HEAP_CEILING}
+
+    def worker_health(self, worker: BrowserWorker) -> str:
+        driver = worker.driver
+        if driver is None:
+            return "dead"
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is not None and process.poll() is not None:
+            return "dead"
+        cdp = worker.cdp
+        if cdp is not None and not cdp.closed.is_set():
+            try:
+                cdp.call("Browser.getVersion", timeout=HEALTH_TIMEOUT)
+                return "ok"
+            except TimeoutError:
+                return "unresponsive"
+            except CdpError:
+                pass
+        try:
+            browser_websocket_url(driver.capabilities["goog:chromeOptions"]["debuggerAddress"], HEALTH_TIMEOUT)
+        except Exception as exc:
+            return "unresponsive" if isinstance(getattr(exc, "reason", exc), TimeoutError) else "dead"
+        return "ok"
+
+    def run_watchdog(self) -> None:
+        while not self.stop_event.is_set():
+            self.watchdog_wake.wait(WATCHDOG_INTERVAL if WATCHDOG_INTERVAL > 0 else None)
+            self.watchdog_wake.clear()
+            for worker in list(self.workers):
+                if self.stop_event.is_set():
+                    return
+                health = self.worker_health(worker)
+                with self.lock:
+                    strikes = self.worker_strikes.get(worker, 0) + 1 if health != "ok" else 0
+                    self.worker_strikes[worker] = strikes
+                if needs_failover(health, strikes):
+                    with suppress(Exception):
+                        self.fail_over(worker)
+            standby = self.standby
+            if standby is not None and self.worker_health(standby) == "dead":
+                with self.lock:
+                    if self.standby is standby:
+                        self.standby = None
+                threading.Thread(target=standby.quit, daemon=True).start()
+            self.schedule_standby()
+
+    def schedule_standby(self) -> None:
+        with self.lock:
+            if not STANDBY_BROWSER or self.standby is not None or self.standby_starting or not self.workers:
+                return
+            if time.monotonic() < self.standby_retry_at:
+                return
+            self.standby_starting = True
+        threading.Thread(target=self.start_standby, name="standby", daemon=True).start()
+
+    def start_standby(self) -> None:
+        worker = BrowserWorker(WORKER_COUNT)
+        try:
+            worker.start()
+        except Exception:
+            worker.quit()
+            with self.lock:
+                self.standby_starting = False
+                self.standby_retry_at = time.monotonic() + 30
+            return
+        with self.lock:
+            self.standby_starting = False
+            if self.workers and not self.stop_event.is_set():
+                self.standby, worker = worker, None
+        if worker is not None:
+            worker.quit()
+
+    def take_replacement(self, failed: BrowserWorker) -> tuple[BrowserWorker, bool]:
+        with self.lock:
+            standby, self.standby = self.standby, None
+        if standby is not None:
+            if self.worker_health(standby) == "ok":
+                standby.index = failed.index
+                return standby, True
+            threading.Thread(target=standby.quit, daemon=True).start()
+        worker = BrowserWorker(failed.index)
+        try:
+            worker.start()
+        except Exception:
+            worker.quit()
+            raise
+        return worker, False
+
+    def open_restore_tabs(self, worker: BrowserWorker, count: int) -> list[str]:
+        handles: list[str] = []
+        if not count:
+            return handles
+        with suppress(Exception):
+            handles.append(worker.current_handle())
+            cdp = worker.connect_cdp() if count > 1 else None
+            while len(handles) < count:
+                if cdp is not None:
+                    result = cdp.call("Target.createTarget", {"url": "about:blank"})
+                    handles.append(worker.handle_for(result["targetId"]))
+                    continue
+                with worker.lock:
+                    worker.driver.switch_to.new_window("tab")
+                    worker.focused_handle = worker.driver.current_window_handle
+                handles.append(worker.focused_handle)
+        return [handle for handle in handles if handle]
+
+    def rebind_tab(self, entry: dict, handle: str, worker: BrowserWorker) -> None:
+        tab_id = entry["id"]
+        with self.lock:
+            previous = self.id_to_handle.get(tab_id)
+            self.handle_to_id.pop(previous, None)
+            self.handle_to_worker.pop(previous, None)
+            self.tab_meta.pop(previous, None)
+            self.handle_to_id[handle] = tab_id
+            self.id_to_handle[tab_id] = handle
+            self.handle_to_worker[handle] = worker
+            self.page_states.pop(tab_id, None)
+            self.tab_heap.pop(tab_id, None)
+            self.traces.pop(tab_id, None)
+            self.profiles.pop(tab_id, None)
+            recorder = self.recorders.pop(tab_id, None)
+            if recorder is not None:
+                recorder.close()
+            if entry["state"] == "discarded":
+                ready = threading.Event()
+                ready.set()
+                self.tab_states[tab_id] = {"state": "discarded", "since": time.time(), "url": entry["url"], "ready": ready}
+            else:
+                self.tab_states.pop(tab_id, None)
+            if previous is not None and previous == self.active_handle:
+                self.active_handle = handle
+
+    def fail_over(self, failed: BrowserWorker) -> dict | None:
+        with self.failover_lock:
+            started = time.perf_counter()
+            with self.lock:
+                if failed not in self.workers:
+                    return None
+                self.tracked_workers.discard(failed)
+                tabs = []
+                for handle, tab_id in self.handle_to_id.items():
+                    if self.handle_to_worker.get(handle) is not failed:
+                        continue
+                    state = self.tab_states.get(tab_id) or {}
+                    tabs.append({
+                        "id": tab_id,
+                        "url": state.get("url") or (self.tab_meta.get(handle) or {}).get("url"),
+                        "state": state.get("state"),
+                        "active": handle == self.active_handle,
+                    })
+                for handle in [handle for handle, worker in self.pooled.items() if worker is failed]:
+                    del self.pooled[handle]
+            plan = plan_restore(tabs)
+            replacement, promoted = self.take_replacement(failed)
+            handles = self.open_restore_tabs(replacement, len(plan))
+            with self.lock:
+                if failed not in self.workers:
+                    threading.Thread(target=replacement.quit, daemon=True).start()
+                    return None
+                self.workers[self.workers.index(failed)] = replacement
+                self.worker_strikes.pop(failed, None)
+                for entry, handle in sorted(zip(plan, handles), key=lambda item: tab_number(item[0]["id"])):
+                    self.rebind_tab(entry, handle, replacement)
+                for handle in [handle for handle, worker in self.handle_to_worker.items() if worker is failed]:
+                    self.unregister_handle(handle)
+                if self.active_handle not in self.handle_to_id:
+                    self.active_handle = next(iter(self.handle_to_id), None)
+            replacement.session_hooks.append(self.on_session_attached)
+            if not self.watch_targets(replacement):
+                self.sync_tabs(replacement, force=True)
+            for entry, handle in zip(plan, handles):
+                if entry["url"] and entry["state"] is None:
+                    with suppress(Exception):
+                        replacement.target_call(handle, "Page.navigate", {"url": entry["url"]})
+            report = {
+                "worker": replacement.index,
+                "at": time.time(),
+                "standby": promoted,
+                "restored": len(handles),
+                "lost": len(plan) - len(handles),
+                "recovery_ms": round((time.perf_counter() - started) * 1000, 3),
+            }
+            with self.lock:
+                self.watchdog_stats["failovers"] += 1
+                self.watchdog_stats["last"] = report
+        threading.Thread(target=failed.quit, daemon=True).start()
+        self.schedule_standby()
+        self.schedule_pool_fill()
+        return report
 
     def tabs_list(self) -> dict:
-        self.sync_tabs()
-        items = []
-        for handle, tab_id in self.handle_to_id.items():
-            item = {"id": tab_id, "handle": handle, "active": handle == self.active_handle}
-            with suppress(WebDriverException):
-                self.driver.switch_to.window(handle)
-                item["url"] = self.driver.current_url
-                item["title"] = self.driver.title
-            items.append(item)
-        return {"tabs": items}
+        return {"tabs": self.describe_tabs()}
 
     def tabs_focus(self, payload: dict) -> dict:
         handle = self.resolve_handle(payload.get("tab"))
-        self.driver.switch_to.window(handle)
+        self.worker_of(handle).focus(handle)
         self.active_handle = handle
         tab_id = self.handle_to_id.get(handle)
         return {"tab": tab_id, "handle": handle}
 
     def tabs_close(self, payload: dict) -> dict:
-        handle = self.resolve_handle(payload.get("tab"))
-        handles = self.driver.window_handles
-        if len(handles) <= 1:
-            raise RuntimeError("cannot close the last tab")
-        tab_id = self.handle_to_id.get(handle)
-        self.driver.switch_to.window(handle)
-        self.driver.close()
+        handle = self.resolve_handle(payload.get("tab"), thaw=False)
+        worker = self.worker_of(handle)
+        recycle = payload.get("recycle")
+        if TAB_POOL_RECYCLE if recycle is None else recycle:
+            tab_id = self.handle_to_id.get(handle)
+            if self.recycle_tab(worker, handle):
+                with self.lock:
+                    if self.active_handle not in self.handle_to_id:
+                        self.active_handle = next(iter(self.handle_to_id), None)
+                return {"closed": tab_id, "recycled": True}
+        with worker.lock:
+            if self.worker_load(worker) <= 1:
+                raise RuntimeError("cannot close the last tab")
+            tab_id = self.handle_to_id.get(handle)
+            worker.focus(handle).close()
+            worker.forget_handle(handle)
         time.sleep(0.2)
         self.sync_tabs()
-        remaining = self.driver.window_handles
+        remaining = [item for item in worker.window_handles() if item in self.handle_to_id]
         focus_handle = remaining[0] if remaining else None
         if focus_handle:
             with suppress(WebDriverException):
-                self.driver.switch_to.window(focus_handle)
+                worker.focus(focus_handle)
         self.active_handle = focus_handle
         return {"closed": tab_id}
 
@@ -342,77 +1378,269 @@ class SeleniumService:
         url = payload.get("url")
         if not url:
             raise ValueError("url required")
-        self.driver.switch_to.window(handle)
-        self.driver.get(url)
-        return {"tab": self.handle_to_id.get(handle), "url": self.driver.current_url}
+        worker = self.worker_of(handle)
+        if worker.has_cdp:
+            return self.navigate(handle, payload, lambda: worker.target_call(handle, "Page.navigate", {"url": url}))
+        with worker.lock:
+            worker.focus(handle).get(url)
+        return self.wait_for_load(handle, payload)
 
     def nav_reload(self, payload: dict) -> dict:
         handle = self.resolve_handle(payload.get("tab"))
-        self.driver.switch_to.window(handle)
-        self.driver.refresh()
-        return {"tab": self.handle_to_id.get(handle), "url": self.driver.current_url}
+        worker = self.worker_of(handle)
+        if worker.has_cdp:
+            return self.navigate(handle, payload, lambda: worker.target_call(handle, "Page.reload", {}))
+        with worker.lock:
+            worker.focus(handle).refresh()
+        return self.wait_for_load(handle, payload)
 
     def nav_back(self, payload: dict) -> dict:
         handle = self.resolve_handle(payload.get("tab"))
-        self.driver.switch_to.window(handle)
-        self.driver.back()
-        return {"tab": self.handle_to_id.get(handle), "url": self.driver.current_url}
+        worker = self.worker_of(handle)
+        if worker.has_cdp:
+            return self.navigate(handle, payload, lambda: self.navigate_history(worker, handle, -1))
+        with worker.lock:
+            worker.focus(handle).back()
+        return self.wait_for_load(handle, payload)
 
     def nav_forward(self, payload: dict) -> dict:
         handle = self.resolve_handle(payload.get("tab"))
-        self.driver.switch_to.window(handle)
-        self.driver.forward()
-        return {"tab": self.handle_to_id.get(handle), "url": self.driver.current_url}
+        worker = self.worker_of(handle)
+        if worker.has_cdp:
+            return self.navigate(handle, payload, lambda: self.navigate_history(worker, handle, 1))
+        with worker.lock:
+            worker.focus(handle).forward()
+        return self.wait_for_load(handle, payload)
+
+    def navigate_history(self, worker: BrowserWorker, handle: str, offset: int) -> dict | None:
+        history = worker.target_call(handle, "Page.getNavigationHistory")
+        index = history.get("currentIndex", 0) + offset
+        entries = history.get("entries", [])
+        if not 0 <= index < len(entries):
+            return None
+        return worker.target_call(handle, "Page.navigateToHistoryEntry", {"entryId": entries[index]["id"]})
+
+    def navigate(self, handle: str, payload: dict, start) -> dict:
+        strategy = wait_strategy(payload)
+        timeout = float(payload.get("timeout") or PAGE_LOAD_TIMEOUT)
+        deadline = time.monotonic() + timeout
+        worker = self.worker_of(handle)
+        tab_id = self.handle_to_id.get(handle)
+        state = self.page_state(tab_id)
+        if strategy == "networkidle" and not state.network:
+            worker.target_call(handle, "Network.enable", {})
+            state.network = True
+        epoch = state.mark()
+        result = start()
+        if result is None:
+            return {"tab": tab_id, "url": worker.evaluate(handle, "location.href"), "wait": strategy}
+        if result.get("errorText"):
+            raise RuntimeError(f"navigation failed: {result['errorText']}")
+        if strategy != "none":
+            marker = LIFECYCLE_MARKERS[strategy]
+            if not state.wait_lifecycle(marker, result.get("loaderId"), epoch, deadline):
+                raise TimeoutError(f"navigation wait timed out: {strategy}")
+        if strategy == "networkidle":
+            if not state.wait_idle(int(payload.get("idle_ms") or NETWORK_IDLE_MS), deadline):
+                raise TimeoutError("navigation wait timed out: networkidle")
+        if strategy in ("selector", "predicate"):
+            self.wait_for_condition(worker, handle, payload, strategy, deadline)
+        return {"tab": tab_id, "url": worker.evaluate(handle, "location.href"), "wait": strategy}
+
+    def wait_for_condition(
+        self,
+        worker: BrowserWorker,
+        handle: str,
+        payload: dict,
+        strategy: str,
+        deadline: float,
+    ) -> None:
+        if strategy == "selector":
+            check = f"document.querySelector({json.dumps(payload['selector'])})"
+        else:
+            check = payload["predicate"]
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                script = WAIT_SCRIPT % (check, int(remaining * 1000))
+                if worker.evaluate(handle, script, remaining + 5, await_promise=True):
+                    return
+            except RuntimeError:
+                time.sleep(0.05)
+                continue
+            break
+        raise TimeoutError(f"navigation wait timed out: {strategy}")
+
+    def wait_for_load(self, handle: str, payload: dict) -> dict:
+        strategy = wait_strategy(payload)
+        timeout = float(payload.get("timeout") or PAGE_LOAD_TIMEOUT)
+        worker = self.worker_of(handle)
+        deadline = time.monotonic() + timeout
+        while True:
+            with worker.lock:
+                driver = worker.focus(handle)
+                state = driver.execute_script("return document.readyState")
+                url = driver.current_url
+                if strategy == "selector":
+                    ready = driver.execute_script("return !!document.querySelector(arguments[0])", payload["selector"])
+                elif strategy == "predicate":
+                    ready = driver.execute_script(f"return !!({payload['predicate']})")
+                elif strategy == "domcontentloaded":
+                    ready = state in ("interactive", "complete")
+                else:
+                    ready = strategy == "none" or state == "complete"
+            if ready:
+                return {"tab": self.handle_to_id.get(handle), "url": url, "wait": strategy}
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"navigation wait timed out: {strategy}")
+            time.sleep(0.1)
 
     def page_title(self, payload: dict) -> dict:
         handle = self.resolve_handle(payload.get("tab"))
-        self.driver.switch_to.window(handle)
-        return {"tab": self.handle_to_id.get(handle), "title": self.driver.title}
+        worker = self.worker_of(handle)
+        if worker.has_cdp:
+            return {"tab": self.handle_to_id.get(handle), "title": worker.evaluate(handle, "document.title")}
+        with worker.lock:
+            return {"tab": self.handle_to_id.get(handle), "title": worker.focus(handle).title}
 
     def page_url(self, payload: dict) -> dict:
         handle = self.resolve_handle(payload.get("tab"))
-        self.driver.switch_to.window(handle)
-        return {"tab": self.handle_to_id.get(handle), "url": self.driver.current_url}
+        worker = self.worker_of(handle)
+        if worker.has_cdp:
+            return {"tab": self.handle_to_id.get(handle), "url": worker.evaluate(handle, "location.href")}
+        with worker.lock:
+            return {"tab": self.handle_to_id.get(handle), "url": worker.focus(handle).current_url}
 
-    def console_read(self) -> dict:
-        if self.driver is None:
+    def page_perf(self, payload: dict) -> dict:
+        handle = self.resolve_handle(payload.get("tab"))
+        worker = self.worker_of(handle)
+        if worker.has_cdp:
+            sample = worker.evaluate(handle, PERF_SCRIPT)
+            worker.target_call(handle, "Performance.enable", {})
+            result = worker.target_call(handle, "Performance.getMetrics")
+            sample["metrics"] = {item["name"]: item["value"] for item in result.get("metrics", [])}
+        else:
+            with worker.lock:
+                sample = worker.focus(handle).execute_script(f"{VITALS_SCRIPT}\nreturn {READ_SCRIPT};")
+            sample["metrics"] = None
+        return {"tab": self.handle_to_id.get(handle), **sample}
+
+    def page_perf_all(self, payload: dict) -> dict:
+        requests = [{"tab": tab_id} for tab_id in self.selected_tabs(payload)]
+        samples, failed = self.run_on_tabs(self.page_perf, requests)
+        measured = [sample for sample in samples if sample["status"] == "ok"]
+        return {"tabs": samples, "failed": failed, "summary": summarize(measured)}
+
+    def console_read(self, payload: dict) -> dict:
+        if not self.workers:
             raise RuntimeError("driver unavailable")
-        entries = []
-        for entry in self.driver.get_log("browser"):
-            items = {
-                "level": entry.get("level"),
-                "message": entry.get("message"),
-                "timestamp": entry.get("timestamp"),
-            }
-            entries.append(items)
-        return {"entries": entries}
+        tab = self.console_tab(payload.get("tab"))
+        self.collect_driver_logs()
+        entries, cursor = self.console.read(
+            cursor=int(payload.get("cursor") or 0),
+            level=payload.get("level"),
+            tab=tab,
+            pattern=payload.get("pattern"),
+            limit=payload.get("limit"),
+        )
+        return {"entries": entries, "cursor": cursor}
+
+    def console_follow(self, payload: dict, emit: StreamWriter | None) -> dict:
+        if emit is None:
+            raise ValueError("console-follow requires a framed connection")
+        tab = self.console_tab(payload.get("tab"))
+        cursor = payload.get("cursor")
+        cursor = self.console.sequence if cursor is None else int(cursor)
+        while emit.open and not self.stop_event.is_set():
+            self.collect_driver_logs()
+            entries, cursor = self.console.read(
+                cursor=cursor,
+                level=payload.get("level"),
+                tab=tab,
+                pattern=payload.get("pattern"),
+            )
+            for entry in entries:
+                if not emit({"entry": entry}):
+                    return {"cursor": cursor}
+            self.console.wait(cursor, 1.0)
+        return {"cursor": cursor}
+
+    def console_tab(self, tab: str | None) -> str | None:
+        if not tab or tab == "browser":
+            return tab
+        return self.handle_to_id.get(self.match_handle(tab))
+
+    def collect_driver_logs(self) -> None:
+        for worker in self.workers:
+            if worker.has_cdp:
+                continue
+            with worker.lock, suppress(WebDriverException):
+                logs = worker.driver.get_log("browser")
+                for entry in logs:
+                    self.console.append("browser", {
+                        "level": normalize_level(entry.get("level")),
+                        "source": entry.get("source", "browser"),
+                        "message": entry.get("message"),
+                        "timestamp": entry.get("timestamp"),
+                    })
 
     def console_clear(self) -> dict:
-        self.console_read()
+        self.collect_driver_logs()
+        self.console.clear()
         return {"cleared": True}
 
     def cache_clear(self) -> dict:
-        if self.driver is None:
+        if not self.workers:
             raise RuntimeError("driver unavailable")
-        with suppress(Exception):
-            self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
-        with suppress(Exception):
-            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for worker in self.workers:
+            with worker.lock:
+                with suppress(Exception):
+                    worker.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+                with suppress(Exception):
+                    worker.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
         return {"cleared": True}
 
+    def cache_set_mode(self, payload: dict) -> dict:
+        mode = payload.get("mode") or "off"
+        if mode not in CACHE_MODES:
+            raise ValueError("unknown cache mode")
+        if mode != "off" and self.http_store is None:
+            self.http_store = ResponseStore(HTTP_CACHE_DIR, HTTP_CACHE_LIMIT)
+        self.cache_mode = mode
+        self.cache_strict = bool(payload.get("strict")) and mode == "replay"
+        handles, _key = self.interception_scope(None)
+        for handle in handles:
+            with suppress(Exception):
+                self.apply_interception(handle)
+        if self.http_store is not None:
+            self.http_store.flush()
+        return {"mode": mode, "strict": self.cache_strict, "dir": str(HTTP_CACHE_DIR)}
+
+    def cache_stats(self) -> dict:
+        store = self.http_store or ResponseStore(HTTP_CACHE_DIR, HTTP_CACHE_LIMIT)
+        return {"mode": self.cache_mode, "strict": self.cache_strict, "dir": str(HTTP_CACHE_DIR), **store.stats()}
+
+    def cache_purge(self) -> dict:
+        store = self.http_store or ResponseStore(HTTP_CACHE_DIR, HTTP_CACHE_LIMIT)
+        return {"removed": store.clear()}
+
     def storage_clear(self, payload: dict) -> dict:
         handle = self.resolve_handle(payload.get("tab"))
-        self.driver.switch_to.window(handle)
-        url = self.driver.current_url
-        parsed = urlparse(url)
-        if not parsed.scheme or not parsed.netloc:
-            return {"cleared": False, "reason": "no origin"}
-        origin = f"{parsed.scheme}://{parsed.netloc}"
-        with suppress(Exception):
-            self.driver.execute_cdp_cmd(
-                "Storage.clearDataForOrigin",
-                {"origin": origin, "storageTypes": "all"},
-            )
+        worker = self.worker_of(handle)
+        with worker.lock:
+            driver = worker.focus(handle)
+            url = driver.current_url
+            parsed = urlparse(url)
+            if not parsed.scheme or not parsed.netloc:
+                return {"cleared": False, "reason": "no origin"}
+            origin = f"{parsed.scheme}://{parsed.netloc}"
+            with suppress(Exception):
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin",
+                    {"origin": origin, "storageTypes": "all"},
+                )
         return {"cleared": True, "origin": origin}
 
     def network_set(self, payload: dict) -> dict:
@@ -426,41 +1654,267 @@ class SeleniumService:
             params = {"offline": False, "latency": 600, "downloadThroughput": 50 * 1024, "uploadThroughput": 25 * 1024}
         elif profile == "fast":
             params = {"offline": False, "latency": 20, "downloadThroughput": 3 * 1024 * 1024, "uploadThroughput": 1 * 1024 * 1024}
-        with suppress(Exception):
-            self.driver.execute_cdp_cmd("Network.emulateNetworkConditions", params)
+        for worker in self.workers:
+            with worker.lock, suppress(Exception):
+                worker.driver.execute_cdp_cmd("Network.emulateNetworkConditions", params)
         self.network_profile = profile
         return {"profile": profile}
 
     def network_reset(self) -> dict:
-        with suppress(Exception):
-            self.driver.execute_cdp_cmd(
-                "Network.emulateNetworkConditions",
-                {"offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1},
-            )
+        for worker in self.workers:
+            with worker.lock, suppress(Exception):
+                worker.driver.execute_cdp_cmd(
+                    "Network.emulateNetworkConditions",
+                    {"offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1},
+                )
         self.network_profile = "online"
         return {"profile": "online"}
 
+    def network_block(self, payload: dict) -> dict:
+        rules = block_rules(payload)
+        handles, key = self.interception_scope(payload.get("tab"))
+        with self.lock:
+            self.block_rules[key] = rules
+        for handle in handles:
+            self.apply_interception(handle)
+        return {"tab": None if key == "*" else key, **rules}
+
+    def network_unblock(self, payload: dict) -> dict:
+        handles, key = self.interception_scope(payload.get("tab"))
+        with self.lock:
+            removed = self.block_rules.pop(key, None)
+        for handle in handles:
+            self.apply_interception(handle)
+        return {"tab": None if key == "*" else key, "cleared": removed is not None}
+
+    def interception_scope(self, tab: str | None) -> tuple[list[str], str]:
+        if tab:
+            handle = self.resolve_handle(tab)
+            if not self.worker_of(handle).has_cdp:
+                raise RuntimeError("resource blocking requires a devtools connection")
+            return [handle], self.handle_to_id[handle]
+        self.sync_tabs()
+        with self.lock:
+            return list(self.handle_to_id), "*"
+
+    def network_record_start(self, payload: dict) -> dict:
+        handle = self.resolve_handle(payload.get("tab"))
+        worker = self.worker_of(handle)
+        if not worker.has_cdp:
+            raise RuntimeError("network capture requires a devtools connection")
+        tab_id = self.handle_to_id.get(handle)
+        if tab_id in self.recorders:
+            raise RuntimeError("network capture already running")
+        path = Path(payload.get("path") or RUNTIME_DIR / f"network-{tab_id}-{int(time.time())}.jsonl")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.recorders[tab_id] = NetworkRecorder(tab_id, path)
+        worker.target_call(handle, "Network.enable", {})
+        return {"tab": tab_id, "events": str(path)}
+
+    def network_record_stop(self, payload: dict) -> dict:
+        handle = self.resolve_handle(payload.get("tab"))
+        tab_id = self.handle_to_id.get(handle)
+        recorder = self.recorders.pop(tab_id, None)
+        if recorder is None:
+            raise RuntimeError("network capture not running")
+        recorder.close()
+        har_path = Path(payload.get("har") or recorder.path.with_suffix(".har"))
+        entries = write_har(recorder.path, har_path)
+        return {"tab": tab_id, "path": str(har_path), "events": str(recorder.path), "entries": entries}
+
+    def devtools_tab(self, payload: dict, feature: str) -> tuple[BrowserWorker, str, str]:
+        handle = self.resolve_handle(payload.get("tab"))
+        worker = self.worker_of(handle)
+        if not worker.has_cdp:
+            raise RuntimeError(f"{feature} requires a devtools connection")
+        return worker, handle, self.handle_to_id.get(handle)
+
+    def trace_start(self, payload: dict) -> dict:
+        worker, handle, tab_id = self.devtools_tab(payload, "tracing")
+        if tab_id in self.traces:
+            raise RuntimeError("trace already running")
+        path = Path(payload.get("path") or RUNTIME_DIR / f"trace-{tab_id}-{time.time_ns()}.json")
+        self.traces[tab_id] = {"path": path, "complete": Future()}
+        try:
+            worker.target_call(
+                handle,
+                "Tracing.start",
+                {
+                    "transferMode": "ReturnAsStream",
+                    "streamFormat": "json",
+                    "traceConfig": trace_config(payload.get("categories")),
+                },
+            )
+        except Exception:
+            self.traces.pop(tab_id, None)
+            raise
+        return {"tab": tab_id, "path": str(path)}
+
+    def trace_stop(self, payload: dict) -> dict:
+        worker, handle, tab_id = self.devtools_tab(payload, "tracing")
+        trace = self.traces.get(tab_id)
+        if trace is None:
+            raise RuntimeError("trace not running")
+        try:
+            worker.target_call(handle, "Tracing.end")
+            stream = trace["complete"].result(PAGE_LOAD_TIMEOUT)
+            size = save_stream(worker, handle, stream, trace["path"])
+        finally:
+            self.traces.pop(tab_id, None)
+        return {"tab": tab_id, "path": str(trace["path"]), "bytes": size}
+
+    def profile_start(self, payload: dict) -> dict:
+        worker, handle, tab_id = self.devtools_tab(payload, "profiling")
+        if tab_id in self.profiles:
+            raise RuntimeError("profile already running")
+        path = Path(payload.get("path") or RUNTIME_DIR / f"profile-{tab_id}-{time.time_ns()}.cpuprofile")
+        worker.target_call(handle, "Profiler.enable")
+        interval = int(payload.get("interval_us") or PROFILE_INTERVAL_US)
+        worker.target_call(handle, "Profiler.setSamplingInterval", {"interval": interval})
+        worker.target_call(handle, "Profiler.start")
+        self.profiles[tab_id] = path
+        return {"tab": tab_id, "path": str(path)}
+
+    def profile_stop(self, payload: dict) -> dict:
+        worker, handle, tab_id = self.devtools_tab(payload, "profiling")
+        path = self.profiles.pop(tab_id, None)
+        if path is None:
+            raise RuntimeError("profile not running")
+        result = worker.target_call(handle, "Profiler.stop")
+        with suppress(Exception):
+            worker.target_call(handle, "Profiler.disable")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as target:
+            json.dump(result.get("profile") or {}, target)
+        samples = len((result.get("profile") or {}).get("samples", []))
+        return {"tab": tab_id, "path": str(path), "samples": samples}
+
     def script_run(self, payload: dict) -> dict:
         handle = self.resolve_handle(payload.get("tab"))
         script = payload.get("script")
         if script is None:
             raise ValueError("script required")
-        self.driver.switch_to.window(handle)
-        result = self.driver.execute_script(script)
+        worker = self.worker_of(handle)
+        if worker.has_cdp:
+            return {"result": worker.evaluate(handle, f"(function() {{\n{script}\n}})()")}
+        with worker.lock:
+            result = worker.focus(handle).execute_script(script)
         return {"result": result}
 
     def screenshot(self, payload: dict) -> dict:
         handle = self.resolve_handle(payload.get("tab"))
+        worker = self.worker_of(handle)
+        image_format = screenshot_format(payload.get("format"))
+        if worker.has_cdp:
+            data = self.capture_screenshot(worker, handle, payload, image_format)
+        elif image_format != "png" or any(payload.get(key) for key in SCREENSHOT_OPTIONS):
+            raise RuntimeError("screenshot options require a devtools connection")
+        else:
+            with worker.lock:
+                data = worker.focus(handle).get_screenshot_as_base64()
+        result = {"tab": self.handle_to_id.get(handle), "format": image_format}
+        if payload.get("inline"):
+            result["data"] = data
+            return result
         target = payload.get("path")
         if not target:
-            runtime_file = RUNTIME_DIR / f"screenshot-{int(time.time())}.png"
+            runtime_file = RUNTIME_DIR / f"screenshot-{time.time_ns()}.{image_format}"
             target = str(runtime_file)
-        self.driver.switch_to.window(handle)
-        self.driver.save_screenshot(target)
-        return {"path": target}
+        Path(target).write_bytes(base64.b64decode(data))
+        result["path"] = target
+        return result
 
-    def resolve_handle(self, token: str | None) -> str:
+    def screenshot_all(self, payload: dict) -> dict:
+        started = time.monotonic()
+        image_format = screenshot_format(payload.get("format"))
+        directory = Path(payload.get("dir") or RUNTIME_DIR / f"screenshots-{time.time_ns()}")
+        if not payload.get("inline"):
+            directory.mkdir(parents=True, exist_ok=True)
+        requests = [
+            {**payload, "tab": tab_id, "path": str(directory / f"{tab_id}.{image_format}")}
+            for tab_id in self.selected_tabs(payload)
+        ]
+        shots, failed = self.run_on_tabs(self.screenshot, requests)
+        elapsed_ms = round((time.monotonic() - started) * 1000, 3)
+        return {"shots": shots, "failed": failed, "elapsed_ms": elapsed_ms}
+
+    def selected_tabs(self, payload: dict) -> list[str]:
         self.sync_tabs()
+        with self.lock:
+            return payload.get("tabs") or list(self.handle_to_id.values())
+
+    def run_on_tabs(self, handler, requests: list[dict]) -> tuple[list[dict], int]:
+        pending = []
+        for request in requests:
+            tab_id = request["tab"]
+            try:
+                handle = self.resolve_handle(tab_id)
+                request = {**request, "tab": self.handle_to_id[handle]}
+                pending.append((tab_id, self.tab_queue(request["tab"]).submit(handler, request)))
+            except Exception as exc:
+                pending.append((tab_id, exc))
+        results = []
+        failed = 0
+        for tab_id, job in pending:
+            try:
+                if isinstance(job, Exception):
+                    raise job
+                results.append({"status": "ok", **job.result()})
+            except Exception as exc:
+                failed += 1
+                results.append({"status": "error", "tab": tab_id, "message": str(exc)})
+        return results, failed
+
+    def capture_screenshot(self, worker: BrowserWorker, handle: str, payload: dict, image_format: str) -> str:
+        params = {"format": image_format}
+        if payload.get("quality") is not None and image_format != "png":
+            params["quality"] = max(0, min(100, int(payload["quality"])))
+        clip = payload.get("clip")
+        if payload.get("selector"):
+            clip = worker.evaluate(handle, ELEMENT_RECT_SCRIPT % json.dumps(payload["selector"]))
+            if clip is None:
+                raise ValueError("element not found")
+            params["captureBeyondViewport"] = True
+        elif payload.get("full_page"):
+            metrics = worker.target_call(handle, "Page.getLayoutMetrics")
+            size = metrics.get("cssContentSize") or metrics.get("contentSize") or {}
+            clip = {"x": 0, "y": 0, "width": size.get("width", 0), "height": size.get("height", 0)}
+            params["captureBeyondViewport"] = True
+        scale = payload.get("scale")
+        if clip:
+            params["clip"] = {
+                "x": float(clip["x"]),
+                "y": float(clip["y"]),
+                "width": float(clip["width"]),
+                "height": float(clip["height"]),
+                "scale": float(scale or 1),
+            }
+            return worker.target_call(handle, "Page.captureScreenshot", params)["data"]
+        if not scale:
+            return worker.target_call(handle, "Page.captureScreenshot", params)["data"]
+        worker.target_call(
+            handle,
+            "Emulation.setDeviceMetricsOverride",
+            {"width": 0, "height": 0, "deviceScaleFactor": float(scale), "mobile": False},
+        )
+        try:
+            return worker.target_call(handle, "Page.captureScreenshot", params)["data"]
+        finally:
+            with suppress(Exception):
+                worker.target_call(handle, "Emulation.clearDeviceMetricsOverride")
+
+    def resolve_handle(self, token: str | None, thaw: bool = True) -> str:
+        handle = self.match_handle(token)
+        if thaw:
+            self.thaw_tab(handle)
+        else:
+            self.touch_tab(self.handle_to_id.get(handle))
+        return handle
+
+    def match_handle(self, token: str | None) -> str:
+        handle = self.lookup_handle(token)
+        worker = self.handle_to_worker.get(handle) if handle else None
+        self.sync_tabs(worker)
         if token in (None, "", "active"):
             if self.active_handle is None:
                 raise RuntimeError("no active tab")
@@ -474,20 +1928,61 @@ class SeleniumService:
             return token
         raise ValueError("unknown tab reference")
 
+    def lookup_handle(self, token: str | None) -> str | None:
+        with self.lock:
+            if token in (None, "", "active"):
+                return self.active_handle
+            if token in self.id_to_handle:
+                return self.id_to_handle[token]
+            if token in self.handle_to_id:
+                return token
+            return None
+
     def shutdown(self) -> None:
-        with suppress(Exception):
-            if self.driver is not None:
-                self.driver.quit()
-        self.driver = None
+        with self.lock:
+            queues = list(self.tab_queues.values())
+            self.tab_queues.clear()
+            workers = list(self.workers)
+            self.workers = []
+            if self.standby is not None:
+                workers.append(self.standby)
+                self.standby = None
+        for queue in queues:
+            queue.shutdown(wait=False)
+        self.pool_executor.shutdown(wait=False)
+        for recorder in list(self.recorders.values()):
+            recorder.close()
+        self.recorders.clear()
+        self.cache_writer.shutdown(wait=False)
+        if self.http_store is not None:
+            with suppress(Exception):
+                self.http_store.flush()
+        if workers:
+            with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+                for worker in workers:
+                    executor.submit(worker.quit)
         self.active_handle = None
         self.id_to_handle.clear()
         self.handle_to_id.clear()
-        if self.profile_dir is not None:
-            with suppress(Exception):
-                shutil.rmtree(self.profile_dir)
-            self.profile_dir = None
+        self.handle_to_worker.clear()
+        self.pooled.clear()
+        self.tracked_workers.clear()
+        self.tab_meta.clear()
         with suppress(FileNotFoundError):
             PID_PATH.unlink()
+        if isinstance(SERVICE_ADDRESS, str):
+            with suppress(FileNotFoundError):
+                os.unlink(SERVICE_ADDRESS)
+
+
+def startup_error(exc: BaseException) -> dict:
+    lines = [line.strip() for line in str(exc).splitlines() if line.strip()]
+    return {
+        "status": "error",
+        "error": type(exc).__name__,
+        "message": lines[0] if lines else type(exc).__name__,
+        "detail": lines[1:10],
+    }
 
 
 def run_service() -> None:
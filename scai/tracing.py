@@ -0,0 +1,43 @@
+import base64
+from contextlib import suppress
+from pathlib import Path
+
+from .browser import BrowserWorker
+
+TRACE_CATEGORIES = (
+    "devtools.timeline",
+    "v8.execute",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "disabled-by-default-devtools.timeline.stack",
+    "disabled-by-default-v8.cpu_profiler",
+    "toplevel",
+    "blink.console",
+    "blink.user_timing",
+    "latencyInfo",
+)
+IO_CHUNK_SIZE = 1 << 20
+PROFILE_INTERVAL_US = 100
+
+
+def trace_config(categories: list[str] | None) -> dict:
+    return {"includedCategories": list(categories or TRACE_CATEGORIES), "recordMode": "recordContinuously"}
+
+
+def save_stream(worker: BrowserWorker, handle: str, stream: str, path: Path) -> int:
+    size = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with path.open("wb") as target:
+            while True:
+                chunk = worker.target_call(handle, "IO.read", {"handle": stream, "size": IO_CHUNK_SIZE})
+                data = chunk.get("data", "")
+                content = base64.b64decode(data) if chunk.get("base64Encoded") else data.encode("utf-8")
+                target.write(content)
+                size += len(content)
+                if chunk.get("eof"):
+                    break
+    finally:
+        with suppress(Exception):
+            worker.target_call(handle, "IO.close", {"handle": stream})
+    return size
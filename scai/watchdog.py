@@ -0,0 +1,26 @@
+HEALTH_TIMEOUT = 2.0
+UNRESPONSIVE_LIMIT = 3
+RESTORABLE_SCHEMES = ("http://", "https://", "file://")
+
+
+def tab_number(tab_id: str) -> int:
+    suffix = tab_id.rsplit("-", 1)[-1]
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def plan_restore(tabs: list[dict]) -> list[dict]:
+    plan = []
+    for tab in sorted(tabs, key=lambda tab: (not tab.get("active"), tab_number(tab["id"]))):
+        url = tab.get("url") or ""
+        restorable = url.startswith(RESTORABLE_SCHEMES)
+        plan.append({
+            "id": tab["id"],
+            "url": url if restorable else None,
+            "state": "discarded" if restorable and tab.get("state") == "discarded" else None,
+            "active": bool(tab.get("active")),
+        })
+    return plan
+
+
+def needs_failover(health: str, strikes: int) -> bool:
+    return health == "dead" or (health == "unresponsive" and strikes >= UNRESPONSIVE_LIMIT)
@@ -0,0 +1,190 @@
+import argparse
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from fixture_server import FixtureServer  # noqa: E402
+
+from scai.config import SERVICE_ADDRESS  # noqa: E402
+from scai.protocol import ServiceClient, connect  # noqa: E402
+
+SCAI = ROOT / "scai" / "scai.sh"
+
+
+def run_cli(*parts: str) -> str:
+    result = subprocess.run([str(SCAI), *parts], cwd=str(ROOT), check=True, text=True, capture_output=True)
+    return result.stdout.strip()
+
+
+def request(client: ServiceClient, payload: dict) -> dict:
+    response = client.request(payload)
+    if response.get("status") != "ok":
+        raise RuntimeError(f"{payload.get('command')}: {response.get('message')}")
+    return response.get("result") or {}
+
+
+def timed(action) -> float:
+    started = time.perf_counter()
+    action()
+    return (time.perf_counter() - started) * 1000
+
+
+def summarize(samples: list[float], unit: str = "ms") -> dict:
+    ordered = sorted(samples)
+
+    def rank(q: float) -> float:
+        return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+    return {
+        "value": round(rank(0.5), 3),
+        "unit": unit,
+        "n": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p95": round(rank(0.95), 3),
+        "min": round(ordered[0], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def bench_cold_start(results: dict) -> None:
+    subprocess.run([str(SCAI), "service", "stop"], cwd=str(ROOT), check=False, capture_output=True)
+    results["cold_start_ms"] = {"value": round(timed(lambda: run_cli("service", "start")), 3), "unit": "ms"}
+
+
+def bench_round_trip(results: dict, client: ServiceClient, tab: str, iterations: int) -> None:
+    cli = [timed(lambda: run_cli("page", "url", "--tab", tab)) for _ in range(iterations)]
+    socket = [timed(lambda: request(client, {"command": "page-url", "tab": tab})) for _ in range(iterations)]
+    results["round_trip_cli_ms"] = summarize(cli)
+    results["round_trip_socket_ms"] = summarize(socket)
+
+
+def bench_navigation(results: dict, client: ServiceClient, tabs: list[str], url: str, pages: int) -> None:
+    started = time.perf_counter()
+    inflight: dict[int, str] = {}
+    free = list(tabs)
+    sent = 0
+    completed = 0
+    while completed < pages:
+        while free and sent < pages:
+            tab = free.pop()
+            inflight[client.send({"command": "nav-go", "tab": tab, "url": f"{url}&n={sent}"})] = tab
+            sent += 1
+        message = client.receive_any()
+        tab = inflight.pop(message.get("id"), None)
+        if tab is None:
+            continue
+        if message.get("status") != "ok":
+            raise RuntimeError(f"nav-go: {message.get('message')}")
+        completed += 1
+        free.append(tab)
+    elapsed = time.perf_counter() - started
+    results["navigation_per_s"] = {"value": round(pages / elapsed, 3), "unit": "per_s", "tabs": len(tabs), "pages": pages}
+
+
+def bench_tab_scaling(results: dict, client: ServiceClient, url: str, counts: list[int], iterations: int) -> None:
+    opened = []
+    for count in sorted(counts):
+        while len(opened) < count:
+            tab = request(client, {"command": "tabs-open"})["tab"]
+            request(client, {"command": "nav-go", "tab": tab, "url": url})
+            opened.append(tab)
+        samples = [timed(lambda: request(client, {"command": "tabs-list"})) for _ in range(iterations)]
+        results[f"tabs_list_{count}_ms"] = summarize(samples)
+    for tab in opened:
+        request(client, {"command": "tabs-close", "tab": tab})
+
+
+def bench_screenshots(results: dict, client: ServiceClient, tab: str, iterations: int, output_dir: Path) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cli = []
+    for index in range(iterations):
+        target = output_dir / f"cli-{index}.png"
+        cli.append(timed(lambda: run_cli("snapshot", "save", "--tab", tab, "--path", str(target))))
+    socket = [timed(lambda: request(client, {"command": "screenshot", "tab": tab, "inline": True})) for _ in range(iterations)]
+    every = [
+        timed(lambda: request(client, {"command": "screenshot-all", "inline": True}))
+        for _ in range(max(1, iterations // 4))
+    ]
+    results["screenshot_cli_ms"] = summarize(cli)
+    results["screenshot_socket_ms"] = summarize(socket)
+    results["screenshot_all_ms"] = summarize(every)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[dict]:
+    report = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get("value"):
+            continue
+        ratio = current["value"] / previous["value"]
+        if current["unit"] == "per_s":
+            regressed = ratio < 1 - tolerance
+        else:
+            regressed = ratio > 1 + tolerance
+        report.append({"metric": name, "baseline": previous["value"], "current": current["value"], "ratio": round(ratio, 3), "regressed": regressed})
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="bench_scai")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--tabs", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--tab-counts", default="1,5,10,20")
+    parser.add_argument("--size", type=int, default=16384)
+    parser.add_argument("--resources", type=int, default=10)
+    parser.add_argument("--latency", type=int, default=20)
+    parser.add_argument("--cert")
+    parser.add_argument("--key")
+    parser.add_argument("--skip-cold-start", action="store_true")
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    results: dict[str, dict] = {}
+    with FixtureServer(certfile=args.cert, keyfile=args.key) as fixture:
+        url = fixture.url(args.size, args.resources, args.latency)
+        if not args.skip_cold_start:
+            bench_cold_start(results)
+        else:
+            run_cli("service", "start")
+        client = connect(SERVICE_ADDRESS)
+        counts = [int(value) for value in args.tab_counts.split(",") if value]
+        bench_tab_scaling(results, client, fixture.url(1024), counts, args.iterations)
+        tabs = [request(client, {"command": "tabs-open"})["tab"] for _ in range(max(1, args.tabs))]
+        try:
+            request(client, {"command": "nav-go", "tab": tabs[0], "url": url})
+            bench_round_trip(results, client, tabs[0], args.iterations)
+            bench_navigation(results, client, tabs, url, args.pages)
+            bench_screenshots(results, client, tabs[0], args.iterations, ROOT / "scai" / "runtime" / "bench")
+        finally:
+            for tab in tabs:
+                request(client, {"command": "tabs-close", "tab": tab})
+            client.close()
+    report = {
+        "timestamp": time.time(),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "parameters": vars(args),
+        "results": results,
+    }
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        report["comparison"] = compare(results, baseline.get("results", baseline), args.tolerance)
+        regressions = [item for item in report["comparison"] if item["regressed"]]
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+import argparse
+import base64
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PIXEL = base64.b64decode("R0lGODlhAQABAIAAAP///wAAACH5BAEAAAAALAAAAAABAAEAAAICRAEAOw==")
+FIXTURE_TITLE = "Fixture Page"
+
+
+def query_int(query: dict[str, list[str]], name: str, default: int = 0) -> int:
+    try:
+        return max(0, int(query.get(name, [default])[0]))
+    except ValueError:
+        return default
+
+
+def render_page(size: int, resources: int, latency: int) -> bytes:
+    assets = "".join(f'<img src="/asset?i={index}&latency={latency}" alt="">' for index in range(resources))
+    filler = ("lorem ipsum " * (size // 12 + 1))[:size]
+    html = (
+        f"<!doctype html><html><head><title>{FIXTURE_TITLE}</title></head>"
+        f"<body><h1 id=\"ready\">{FIXTURE_TITLE}</h1><p>{filler}</p>{assets}</body></html>"
+    )
+    return html.encode("utf-8")
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        latency = query_int(query, "latency")
+        if latency:
+            time.sleep(latency / 1000)
+        if parts.path == "/asset":
+            self.respond(200, "image/gif", PIXEL)
+        elif parts.path in ("/", "/page"):
+            body = render_page(query_int(query, "size", 1024), query_int(query, "resources"), latency)
+            self.respond(200, "text/html; charset=utf-8", body)
+        else:
+            self.respond(404, "text/plain", b"not found")
+
+    def respond(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+class FixtureServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, certfile: str | None = None, keyfile: str | None = None) -> None:
+        self.server = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.server.daemon_threads = True
+        self.scheme = "http"
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            self.scheme = "https"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"{self.scheme}://{host}:{port}"
+
+    def url(self, size: int = 1024, resources: int = 0, latency: int = 0) -> str:
+        return f"{self.base_url}/page?size={size}&resources={resources}&latency={latency}"
+
+    def __enter__(self) -> "FixtureServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="fixture_server")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cert")
+    parser.add_argument("--key")
+    args = parser.parse_args()
+    with FixtureServer(port=args.port, certfile=args.cert, keyfile=args.key) as fixture:
+        print(fixture.base_url, flush=True)
+        fixture.thread.join()
+
+
+if __name__ == "__main__":
+    main()
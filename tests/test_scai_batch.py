@@ -0,0 +1,26 @@
+import pytest
+
+from scai.batch import parse_steps, resolve_references
+
+
+def test_parse_steps_accepts_array_object_and_jsonl() -> None:
+    assert parse_steps('[{"command": "ping"}]') == ([{"command": "ping"}], {})
+    steps, options = parse_steps('{"steps": [{"command": "ping"}], "continue_on_error": true}')
+    assert steps == [{"command": "ping"}]
+    assert options == {"continue_on_error": True}
+    assert parse_steps('{"command": "tabs-open"}\n\n{"command": "ping"}\n') == (
+        [{"command": "tabs-open"}, {"command": "ping"}],
+        {},
+    )
+
+
+def test_resolve_references_by_name_index_and_prev() -> None:
+    results = {"0": {"tab": "tab-2"}, "t": {"tab": "tab-2"}, "prev": {"tabs": [{"id": "tab-1"}]}}
+    step = {"tab": "${t.tab}", "url": "https://example.com/?t=${0.tab}", "first": "${prev.tabs.0.id}"}
+    assert resolve_references(step, results) == {
+        "tab": "tab-2",
+        "url": "https://example.com/?t=tab-2",
+        "first": "tab-1",
+    }
+    with pytest.raises(ValueError):
+        resolve_references("${missing.tab}", results)
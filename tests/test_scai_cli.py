@@ -2,6 +2,7 @@ import json
 import subprocess
 from pathlib import Path
 
+from fixture_server import FIXTURE_TITLE, FixtureServer
 
 ROOT = Path(__file__).resolve().parents[1]
 
@@ -19,15 +20,16 @@ def run_cmd(*parts: str) -> str:
 
 def test_end_to_end() -> None:
     subprocess.run(["./scai/scai.sh", "service", "stop"], cwd=str(ROOT), check=False, capture_output=True)
-    tab_id = run_cmd("tab", "open")
-    assert tab_id.startswith("tab-")
-    url = run_cmd("nav", "go", "https://example.com", "--tab", tab_id)
-    assert "example.com" in url
-    title = run_cmd("page", "title", "--tab", tab_id)
-    assert title == "Example Domain"
-    info_raw = run_cmd("tab", "info", tab_id)
-    info = json.loads(info_raw)
-    assert info["url"].startswith("https://example.com")
+    with FixtureServer() as fixture:
+        tab_id = run_cmd("tab", "open")
+        assert tab_id.startswith("tab-")
+        url = run_cmd("nav", "go", fixture.url(), "--tab", tab_id)
+        assert url.startswith(fixture.base_url)
+        title = run_cmd("page", "title", "--tab", tab_id)
+        assert title == FIXTURE_TITLE
+        info_raw = run_cmd("tab", "info", tab_id)
+        info = json.loads(info_raw)
+        assert info["url"].startswith(fixture.base_url)
     run_cmd("network", "set", "slow")
     run_cmd("network", "reset")
     run_cmd("logs", "read")
@@ -0,0 +1,50 @@
+import io
+from pathlib import Path
+
+from scai.crawl import Crawler, load_checkpoint, read_urls, substitute
+
+
+class RecordingClient:
+    def __init__(self) -> None:
+        self.sent: dict[int, dict] = {}
+        self.unanswered: list[int] = []
+
+    def request(self, payload: dict) -> dict:
+        return {"status": "ok", "result": {"tab": "tab-1"}}
+
+    def send(self, payload: dict) -> int:
+        request_id = len(self.sent) + 1
+        self.sent[request_id] = payload
+        self.unanswered.append(request_id)
+        return request_id
+
+    def receive_any(self) -> dict:
+        return {"id": self.unanswered.pop(0), "status": "ok", "result": {}}
+
+
+def test_url_sources_checkpoint_and_substitution(tmp_path: Path) -> None:
+    assert list(read_urls(["https://a.test/\n", "\n", "# skipped\n", " https://b.test/ "])) == [
+        "https://a.test/",
+        "https://b.test/",
+    ]
+    checkpoint = tmp_path / "done.txt"
+    assert load_checkpoint(checkpoint) == set()
+    checkpoint.write_text("https://a.test/\n", encoding="utf-8")
+    assert load_checkpoint(checkpoint) == {"https://a.test/"}
+    step = {"command": "screenshot", "path": "shots/${index}.png", "args": ["${url}", "${prev.title}"]}
+    assert substitute(step, {"url": "https://a.test/", "index": "3"}) == {
+        "command": "screenshot",
+        "path": "shots/3.png",
+        "args": ["https://a.test/", "${prev.title}"],
+    }
+
+
+def test_resumed_crawl_keeps_input_positions_for_index(tmp_path: Path) -> None:
+    checkpoint = tmp_path / "done.txt"
+    checkpoint.write_text("https://a.test/\n", encoding="utf-8")
+    client = RecordingClient()
+    steps = [{"command": "screenshot", "path": "shots/${index}.png"}]
+    crawler = Crawler(client, steps, 1, io.StringIO(), checkpoint=checkpoint)
+    summary = crawler.run(["https://a.test/", "https://b.test/", "https://c.test/"])
+    assert (summary["completed"], summary["skipped"]) == (2, 1)
+    assert [payload["steps"][1]["path"] for payload in client.sent.values()] == ["shots/2.png", "shots/3.png"]
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from scai.har import NetworkRecorder, build_har
+
+TIMING = {
+    "requestTime": 100.06,
+    "dnsStart": 1,
+    "dnsEnd": 3,
+    "connectStart": 3,
+    "connectEnd": 10,
+    "sslStart": 5,
+    "sslEnd": 10,
+    "sendStart": 10,
+    "sendEnd": 11,
+    "receiveHeadersEnd": 40,
+}
+
+
+def test_build_har_splits_redirects_and_reports_failures_and_timings(tmp_path: Path) -> None:
+    recorder = NetworkRecorder("tab-1", tmp_path / "events.jsonl")
+    first = {"url": "http://a.test/start?x=1", "method": "GET", "headers": {}}
+    redirect = {"status": 302, "statusText": "Found", "headers": {"Location": "/final"}, "protocol": "http/1.1"}
+    final = {"status": 200, "statusText": "OK", "headers": {}, "mimeType": "text/html", "timing": TIMING}
+    recorder.record("Network.requestWillBeSent", {"requestId": "1", "request": first, "timestamp": 100.0, "wallTime": 1700000000.0, "type": "Document"})
+    recorder.record("Network.requestWillBeSent", {"requestId": "1", "request": {"url": "http://a.test/final"}, "timestamp": 100.05, "redirectResponse": redirect})
+    recorder.record("Network.responseReceived", {"requestId": "1", "response": final, "type": "Document"})
+    recorder.record("Network.dataReceived", {"requestId": "1", "dataLength": 500})
+    recorder.record("Network.loadingFinished", {"requestId": "1", "timestamp": 100.2, "encodedDataLength": 300})
+    recorder.record("Network.requestWillBeSent", {"requestId": "2", "request": {"url": "http://a.test/img.png"}, "timestamp": 100.1, "type": "Image"})
+    recorder.record("Network.loadingFailed", {"requestId": "2", "timestamp": 100.15, "errorText": "net::ERR_BLOCKED_BY_CLIENT"})
+    recorder.close()
+    recorder.record("Network.dataReceived", {"requestId": "2", "dataLength": 1})
+    assert recorder.events == 7
+
+    moved, loaded, failed = build_har(tmp_path / "events.jsonl")["log"]["entries"]
+    assert moved["startedDateTime"] == "2023-11-14T22:13:20.000Z"
+    assert moved["request"]["queryString"] == [{"name": "x", "value": "1"}]
+    assert moved["response"]["status"] == 302 and moved["response"]["redirectURL"] == "/final"
+    assert moved["timings"]["wait"] == 50.0
+    assert loaded["request"]["url"] == "http://a.test/final"
+    assert loaded["response"]["status"] == 200
+    assert loaded["response"]["content"]["size"] == 500 and loaded["response"]["bodySize"] == 300
+    assert loaded["timings"] == {"blocked": 11.0, "dns": 2, "connect": 7, "ssl": 5, "send": 1, "wait": 29, "receive": 100.0}
+    assert loaded["time"] == 150.0
+    assert failed["response"]["status"] == 0
+    assert failed["response"]["statusText"] == "net::ERR_BLOCKED_BY_CLIENT"
+    assert failed["_resourceType"] == "Image" and failed["timings"]["wait"] == 50.0
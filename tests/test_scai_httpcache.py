@@ -0,0 +1,21 @@
+from pathlib import Path
+
+from scai.httpcache import ResponseStore, request_key
+
+
+def test_store_deduplicates_and_evicts_least_recently_used(tmp_path: Path) -> None:
+    store = ResponseStore(tmp_path, 10)
+    first = request_key("GET", "https://example.com/a")
+    second = request_key("GET", "https://example.com/b")
+    store.put(first, "https://example.com/a", 200, [{"name": "Content-Length", "value": "6"}], b"shared")
+    store.put(second, "https://example.com/b", 200, [], b"shared")
+    assert store.stats()["bytes"] == 6
+    entry, content = store.get(first)
+    assert content == b"shared" and entry["headers"] == []
+    third = request_key("POST", "https://example.com/c", "payload")
+    store.put(third, "https://example.com/c", 201, [], b"fresh")
+    assert store.get(second) is None
+    assert store.get(first) is None
+    assert not (tmp_path / "index.json").exists()
+    store.flush()
+    assert ResponseStore(tmp_path, 10).get(third)[1] == b"fresh"
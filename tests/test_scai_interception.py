@@ -0,0 +1,16 @@
+import pytest
+
+from scai.interception import block_rules, fetch_patterns, is_blocked, merge_rules
+
+
+def test_block_rules_merge_and_match() -> None:
+    service_rules = block_rules({"types": ["image", "FONT"]})
+    tab_rules = block_rules({"patterns": ["*://ads.example/*"]})
+    rules = merge_rules([service_rules, tab_rules])
+    assert rules == {"types": ["Font", "Image"], "patterns": ["*://ads.example/*"]}
+    assert len(fetch_patterns(rules)) == 3
+    assert is_blocked(rules, "Image", "https://example.com/logo.png")
+    assert is_blocked(rules, "Script", "https://ads.example/tag.js")
+    assert not is_blocked(rules, "Document", "https://example.com/")
+    with pytest.raises(ValueError):
+        block_rules({"types": ["gif"]})
@@ -0,0 +1,24 @@
+from scai.lifecycle import plan_suspensions
+
+
+def tab(tab_id: str, activity: float, **extra) -> dict:
+    return {"id": tab_id, "worker": 0, "activity": activity, "state": None, "heap": 0, **extra}
+
+
+def test_idle_tabs_freeze_then_discard() -> None:
+    tabs = [tab("a", 0), tab("b", 50, state="frozen"), tab("c", 95), tab("d", 0, protected=True)]
+    assert plan_suspensions(tabs, 100, freeze_idle=30, discard_idle=80) == {"a": "discarded"}
+    assert plan_suspensions(tabs, 100, freeze_idle=30) == {"a": "frozen"}
+
+
+def test_live_limit_and_heap_ceiling_evict_least_recent() -> None:
+    tabs = [tab("a", 10, heap=300), tab("b", 20, heap=300), tab("c", 30, heap=300), tab("d", 40, heap=300, worker=1)]
+    assert plan_suspensions(tabs, 100, max_live=2) == {"a": "frozen", "b": "frozen"}
+    assert plan_suspensions(tabs, 100, heap_ceiling=500) == {"a": "discarded", "b": "discarded"}
+    tabs[0]["discardable"] = False
+    assert plan_suspensions(tabs, 100, heap_ceiling=500) == {"b": "discarded", "c": "discarded"}
+
+
+def test_heap_ceiling_skips_workers_with_only_discarded_tabs() -> None:
+    tabs = [tab("a", 0, worker=1, state="discarded"), tab("b", 0, heap=600)]
+    assert plan_suspensions(tabs, 100, heap_ceiling=500) == {"b": "discarded"}
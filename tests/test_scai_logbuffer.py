@@ -0,0 +1,21 @@
+from scai.logbuffer import LogBuffer
+
+
+def test_ring_buffer_evicts_oldest_across_tabs_and_filters() -> None:
+    buffer = LogBuffer(4)
+    for index in range(5):
+        buffer.append("tab-1", {"level": "error" if index % 2 else "info", "message": f"line {index}"})
+    buffer.append("tab-2", {"level": "warning", "message": "other"})
+    entries, cursor = buffer.read()
+    assert [entry["message"] for entry in entries] == ["line 2", "line 3", "line 4", "other"]
+    buffer.append("tab-2", {"level": "info", "message": "newest"})
+    entries, cursor = buffer.read()
+    assert [entry["message"] for entry in entries] == ["line 3", "line 4", "other", "newest"]
+    assert cursor == 7
+    entries, _cursor = buffer.read(level="warning")
+    assert [entry["message"] for entry in entries] == ["line 3", "other"]
+    entries, _cursor = buffer.read(cursor=4, tab="tab-1", pattern=r"line \d")
+    assert [entry["message"] for entry in entries] == ["line 4"]
+    assert buffer.read(cursor=cursor) == ([], cursor)
+    buffer.drop("tab-1")
+    assert [entry["message"] for entry in buffer.read()[0]] == ["other", "newest"]
@@ -0,0 +1,27 @@
+from scai.metrics import Metrics
+
+
+def test_metrics_snapshot_and_prometheus_output() -> None:
+    metrics = Metrics()
+    for elapsed in (0.002, 0.004, 0.2):
+        metrics.record("nav-go", 0.001, elapsed, True)
+    metrics.record("nav-go", 0.0, 0.05, False)
+    metrics.observe("send", 0.0001)
+    snapshot = metrics.snapshot()
+    command = snapshot["commands"]["nav-go"]
+    assert (command["ok"], command["error"]) == (3, 1)
+    assert command["exec"]["count"] == 4
+    assert command["exec"]["p50"] == 0.005
+    assert command["exec"]["p99"] == 0.2
+    text = metrics.prometheus()
+    assert 'scai_commands_total{command="nav-go",status="error"} 1' in text
+    assert 'scai_command_exec_seconds_bucket{command="nav-go",le="+Inf"} 4' in text
+    assert 'scai_phase_seconds_count{phase="send"} 1' in text
+    metrics.reset()
+    assert metrics.snapshot()["commands"] == {}
+
+
+def test_prometheus_escapes_label_values() -> None:
+    metrics = Metrics()
+    metrics.record('a"b\\c\nd', 0.0, 0.001, True)
+    assert 'command="a\\"b\\\\c\\nd",status="ok"' in metrics.prometheus()
@@ -0,0 +1,20 @@
+import time
+
+from scai.pageload import PageState, wait_strategy
+
+
+def test_lifecycle_and_network_idle_tracking() -> None:
+    state = PageState()
+    epoch = state.mark()
+    state.on_lifecycle("loader-1", "init")
+    state.on_lifecycle("loader-1", "DOMContentLoaded")
+    state.on_lifecycle("loader-0", "load")
+    deadline = time.monotonic() + 0.05
+    assert state.wait_lifecycle("DOMContentLoaded", "loader-1", epoch, deadline)
+    assert not state.wait_lifecycle("load", None, epoch, deadline)
+    state.on_request("request-1", True)
+    assert not state.wait_idle(10, time.monotonic() + 0.05)
+    state.on_request("request-1", False)
+    assert state.wait_idle(10, time.monotonic() + 1)
+    assert wait_strategy({"selector": "#ready"}) == "selector"
+    assert wait_strategy({}) == "load"
@@ -0,0 +1,13 @@
+from scai.perf import percentile, summarize
+
+
+def test_summarize_reports_percentiles_for_measured_fields() -> None:
+    samples = [
+        {"navigation": {"load": float(value)}, "vitals": {"lcp": None, "cls": 0.01 * value}, "metrics": None}
+        for value in range(1, 11)
+    ]
+    summary = summarize(samples)
+    assert summary["load"] == {"count": 10, "p50": 5.0, "p90": 9.0, "p95": 10.0, "max": 10.0}
+    assert "lcp" not in summary and "js_heap_used" not in summary
+    assert summary["cls"]["count"] == 10
+    assert percentile([3.0], 0.99) == 3.0
@@ -0,0 +1,108 @@
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+from scai.protocol import (
+    READ_MARGIN,
+    READ_TIMEOUT,
+    READY_FD_ENV,
+    ClientConnection,
+    ServiceClient,
+    connect,
+    encode_message,
+    listen_socket,
+    notify_ready,
+    read_ready,
+    read_timeout,
+)
+
+
+def test_framed_requests_share_one_connection() -> None:
+    left, right = socket.socketpair()
+    server = ClientConnection(right)
+    client = ServiceClient(left)
+    first = client.send({"command": "ping"})
+    second = client.send({"command": "tabs-list"})
+    payload, framed = server.read_first()
+    assert framed
+    assert payload == {"command": "ping", "id": first}
+    assert server.reader.read_message() == {"command": "tabs-list", "id": second}
+    server.send({"id": second, "status": "ok", "result": {"tabs": []}})
+    server.send({"id": first, "status": "ok", "result": {"pid": 1}})
+    assert client.receive_for(first)["result"] == {"pid": 1}
+    assert client.receive_for(second)["result"] == {"tabs": []}
+    client.close()
+    right.close()
+
+
+def test_oneshot_request_without_newline() -> None:
+    left, right = socket.socketpair()
+    server = ClientConnection(right)
+    body = json.dumps({"command": "ping"}, indent=2).encode("utf-8")
+    thread = threading.Thread(target=lambda: (left.sendall(body), left.shutdown(socket.SHUT_WR)))
+    thread.start()
+    payload, framed = server.read_first()
+    thread.join()
+    assert not framed
+    assert payload == {"command": "ping"}
+    left.close()
+    right.close()
+
+
+def test_encode_message_is_single_line() -> None:
+    data = encode_message({"script": "a\nb"})
+    assert data.endswith(b"\n")
+    assert data.count(b"\n") == 1
+
+
+def test_unix_socket_round_trip(tmp_path: Path) -> None:
+    address = str(tmp_path / "runtime" / "scai.sock")
+    server = listen_socket(address)
+    client = connect(address)
+    conn, _addr = server.accept()
+    peer = ClientConnection(conn)
+    request_id = client.send({"command": "ping"})
+    payload, framed = peer.read_first()
+    assert framed and payload["id"] == request_id
+    peer.send({"id": request_id, "status": "ok", "result": {}})
+    assert client.receive_for(request_id)["status"] == "ok"
+    with pytest.raises(OSError):
+        listen_socket(address)
+    client.close()
+    conn.close()
+    server.close()
+    replacement = listen_socket(address)
+    replacement.close()
+
+
+def test_readiness_pipe(monkeypatch: pytest.MonkeyPatch) -> None:
+    ready_fd, write_fd = os.pipe()
+    monkeypatch.setenv(READY_FD_ENV, str(write_fd))
+    notify_ready({"status": "error", "error": "WebDriverException", "message": "chrome not found"})
+    assert READY_FD_ENV not in os.environ
+    assert read_ready(ready_fd, 1.0) == {"status": "error", "error": "WebDriverException", "message": "chrome not found"}
+    os.close(ready_fd)
+    ready_fd, write_fd = os.pipe()
+    assert read_ready(ready_fd, 0.05) is None
+    os.close(write_fd)
+    assert read_ready(ready_fd, 1.0) == {}
+    os.close(ready_fd)
+
+
+def test_requests_time_out_after_the_command_timeout(tmp_path: Path) -> None:
+    assert read_timeout({"command": "page-url"}) == READ_TIMEOUT
+    assert read_timeout({"command": "nav-go", "timeout": 5}) == 5 + READ_MARGIN
+    assert read_timeout({"command": "batch", "steps": [{"timeout": 1}, {"timeout": 2}]}) == 3 + 2 * READ_MARGIN
+    address = str(tmp_path / "scai.sock")
+    server = listen_socket(address)
+    client = connect(address)
+    conn, _addr = server.accept()
+    with pytest.raises(socket.timeout):
+        client.request({"command": "ping"}, timeout=0.1)
+    client.close()
+    conn.close()
+    server.close()
@@ -0,0 +1,44 @@
+import base64
+from pathlib import Path
+
+from scai.tracing import IO_CHUNK_SIZE, TRACE_CATEGORIES, save_stream, trace_config
+
+
+class StreamWorker:
+    def __init__(self, chunks: list[dict]) -> None:
+        self.chunks = chunks
+        self.calls: list[tuple[str, dict]] = []
+
+    def target_call(self, handle: str, method: str, params: dict | None = None) -> dict:
+        self.calls.append((method, params or {}))
+        if method == "IO.read":
+            return self.chunks.pop(0)
+        return {}
+
+
+def test_trace_config_defaults_and_overrides() -> None:
+    assert trace_config(None) == {"includedCategories": list(TRACE_CATEGORIES), "recordMode": "recordContinuously"}
+    assert trace_config(["toplevel"])["includedCategories"] == ["toplevel"]
+
+
+def test_save_stream_decodes_chunks_until_eof_and_closes(tmp_path: Path) -> None:
+    worker = StreamWorker([
+        {"data": base64.b64encode(b'{"traceEvents":[').decode(), "base64Encoded": True},
+        {"data": "{}]}", "eof": False},
+        {"data": "", "eof": True},
+    ])
+    path = tmp_path / "trace" / "out.json"
+    assert save_stream(worker, "tab", "stream-1", path) == 20
+    assert path.read_bytes() == b'{"traceEvents":[{}]}'
+    assert worker.calls[0] == ("IO.read", {"handle": "stream-1", "size": IO_CHUNK_SIZE})
+    assert worker.calls[-1] == ("IO.close", {"handle": "stream-1"})
+    assert len(worker.calls) == 4
+
+
+def test_save_stream_closes_stream_when_read_fails(tmp_path: Path) -> None:
+    worker = StreamWorker([{"data": "partial"}])
+    try:
+        save_stream(worker, "tab", "stream-2", tmp_path / "out.json")
+    except IndexError:
+        pass
+    assert worker.calls[-1] == ("IO.close", {"handle": "stream-2"})
@@ -0,0 +1,116 @@
+import threading
+from pathlib import Path
+
+from scai import service
+from scai.watchdog import UNRESPONSIVE_LIMIT, needs_failover, plan_restore
+
+
+def test_restore_plan_puts_active_tab_first_and_keeps_discarded_tabs_lazy() -> None:
+    tabs = [
+        {"id": "tab-10", "url": "https://example.com/b", "state": "frozen"},
+        {"id": "tab-2", "url": "about:blank"},
+        {"id": "tab-9", "url": "https://example.com/a", "state": "discarded"},
+        {"id": "tab-3", "url": "http://localhost/", "active": True},
+    ]
+    assert plan_restore(tabs) == [
+        {"id": "tab-3", "url": "http://localhost/", "state": None, "active": True},
+        {"id": "tab-2", "url": None, "state": None, "active": False},
+        {"id": "tab-9", "url": "https://example.com/a", "state": "discarded", "active": False},
+        {"id": "tab-10", "url": "https://example.com/b", "state": None, "active": False},
+    ]
+
+
+def test_failover_on_crash_or_repeated_stalls() -> None:
+    assert needs_failover("dead", 1)
+    assert not needs_failover("ok", 0)
+    assert not needs_failover("unresponsive", UNRESPONSIVE_LIMIT - 1)
+    assert needs_failover("unresponsive", UNRESPONSIVE_LIMIT)
+
+
+class FakeCdp:
+    def __init__(self, worker: "FakeWorker") -> None:
+        self.worker = worker
+        self.closed = threading.Event()
+        self.on_close = None
+
+    def on(self, method: str, listener) -> None:
+        pass
+
+    def call(self, method: str, params: dict | None = None, session_id: str | None = None, timeout: float = 0) -> dict:
+        self.worker.calls.append((method, params or {}, session_id))
+        if method == "Target.createTarget":
+            self.worker.targets.append(f"T{len(self.worker.targets)}")
+            return {"targetId": self.worker.targets[-1]}
+        return {}
+
+    def send(self, method: str, params: dict | None = None, session_id: str | None = None) -> None:
+        self.call(method, params, session_id)
+
+
+class FakeWorker:
+    def __init__(self, index: int, targets: list[str]) -> None:
+        self.index = index
+        self.targets = list(targets)
+        self.calls: list[tuple] = []
+        self.driver = object()
+        self.cdp = FakeCdp(self)
+        self.session_hooks: list = []
+        self.focused_handle = None
+        self.quit_called = threading.Event()
+
+    @property
+    def has_cdp(self) -> bool:
+        return True
+
+    def connect_cdp(self) -> FakeCdp:
+        return self.cdp
+
+    def current_handle(self) -> str:
+        return self.targets[0]
+
+    def window_handles(self) -> list[str]:
+        return list(self.targets)
+
+    def handle_for(self, target_id: str) -> str:
+        return target_id
+
+    def session(self, handle: str) -> str:
+        return f"S-{handle}"
+
+    def target_call(self, handle: str, method: str, params: dict | None = None, timeout: float = 0) -> dict:
+        return self.cdp.call(method, params, self.session(handle))
+
+    def forget_handle(self, handle: str) -> None:
+        pass
+
+    def quit(self) -> None:
+        self.quit_called.set()
+
+
+def test_fail_over_promotes_standby_and_keeps_tab_ids(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(service, "RUNTIME_DIR", tmp_path)
+    monkeypatch.setattr(service.signal, "signal", lambda *_args: None)
+    svc = service.SeleniumService()
+    failed = FakeWorker(0, ["A", "B", "C"])
+    svc.workers = [failed]
+    for handle in failed.targets:
+        svc.register_handle(handle, failed)
+    svc.tab_meta.update({"A": {"url": "about:blank"}, "B": {"url": "https://a.test/"}, "C": {"url": "https://c.test/"}})
+    svc.tab_states["tab-3"] = {"state": "discarded", "url": "https://c.test/"}
+    svc.active_handle = "B"
+    standby = FakeWorker(1, ["N"])
+    svc.standby = standby
+
+    report = svc.fail_over(failed)
+
+    assert svc.workers == [standby] and standby.index == 0
+    assert report["standby"] and report["restored"] == 3 and report["lost"] == 0
+    assert svc.id_to_handle == {"tab-1": "T1", "tab-2": "N", "tab-3": "T2"}
+    assert set(svc.handle_to_worker) == {"N", "T1", "T2"}
+    assert svc.active_handle == "N"
+    assert svc.tab_states["tab-3"]["state"] == "discarded" and svc.tab_states["tab-3"]["ready"].is_set()
+    navigations = [(params["url"], session) for method, params, session in standby.calls if method == "Page.navigate"]
+    assert navigations == [("https://a.test/", "S-N")]
+    assert failed.quit_called.wait(1)
+    svc.cache_writer.shutdown()
+    svc.pool_executor.shutdown()